@@ -1,7 +1,7 @@
-from fastapi import APIRouter, File, UploadFile, Form, HTTPException
-from typing import Optional
+from fastapi import APIRouter, File, UploadFile, Form, HTTPException, Query
+from typing import Optional, BinaryIO, Dict, Any
+import asyncio
 import json
-import shutil
 from pathlib import Path
 from datetime import datetime
 import pandas as pd
@@ -101,28 +101,16 @@ async def transform_data(
                 detail="Schema must contain 'columns' field"
             )
         
-        # Save uploaded file
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        temp_file_path = settings.DOWNLOADS_DIR / f"temp_{timestamp}_{file.filename}"
-        
-        with temp_file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Parse the upload stream directly instead of copying it to a temp file first
+        file.file.seek(0)
         
-        logger.info(f"Saved uploaded file to: {temp_file_path}")
-        
-        # Perform transformation
-        result = DataTransformService.transform_data(
-            csv_file_path=str(temp_file_path),
+        # Perform transformation off the event loop
+        result = await asyncio.to_thread(
+            DataTransformService.transform_data,
+            csv_file_path=file.file,
             schema=schema_dict
         )
         
-        # Clean up temp file
-        try:
-            temp_file_path.unlink()
-            logger.info(f"Cleaned up temp file: {temp_file_path}")
-        except Exception as e:
-            logger.warning(f"Could not delete temp file: {str(e)}")
-        
         return result
     
     except HTTPException:
@@ -137,7 +125,8 @@ async def transform_data(
 
 @router.post("/preprocess")
 async def preprocess_data(
-    file: UploadFile = File(..., description="CSV file to preprocess")
+    file: UploadFile = File(..., description="CSV file to preprocess"),
+    output_format: str = Query("parquet", description="Output format: parquet|csv (gzip-compressed .csv.gz)")
 ):
     """
     Preprocess CSV data only (no schema transformation)
@@ -149,21 +138,23 @@ async def preprocess_data(
     4. Trim whitespace
     5. Remove line endings (^M)
     
-    Returns preprocessed CSV with:
+    Returns preprocessed file (Parquet by default, gzipped CSV on request) with:
     - Clean data
     - Proper data types
     - Report on what was cleaned
     
     Request:
     - file: CSV file (multipart/form-data)
+    - output_format: "parquet" (default, zstd compressed) or "csv" (written as .csv.gz)
     
     Response:
     {
         "status": "success",
-        "preprocessed_file": "/path/to/cleaned.csv",
+        "preprocessed_file": "/path/to/cleaned.parquet",
         "summary": {
             "input_rows": 1000,
             "output_rows": 995,
+            "output_bytes": 20480,
             "duplicates_removed": 5,
             "null_values_standardized": 150,
             "type_conversions": 30,
@@ -184,60 +175,35 @@ async def preprocess_data(
                 detail=f"Unsupported file format. Supported: {', '.join(supported_formats)}"
             )
         
-        # Save uploaded file
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        temp_file_path = settings.DOWNLOADS_DIR / f"temp_{timestamp}_{file.filename}"
-        
-        with temp_file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Validate output format
+        supported_output_formats = ['parquet', 'csv']
+        output_format = output_format.lower()
         
-        logger.info(f"Saved uploaded file to: {temp_file_path}")
-        
-        # Perform preprocessing only
-        
-        
-        # Load CSV
-        if file_ext == '.csv':
-            df = pd.read_csv(temp_file_path)
-        elif file_ext in ['.xlsx', '.xls']:
-            df = pd.read_excel(temp_file_path)
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file format")
-        original_rows = len(df)
-        original_columns = len(df.columns)
-        
-        logger.info(f"Loaded CSV: {original_rows} rows, {original_columns} columns")
+        if output_format not in supported_output_formats:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported output format. Supported: {', '.join(supported_output_formats)}"
+            )
         
-        # Preprocess
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        df_preprocessed, preprocessing_summary = DataTransformService._preprocess(df)
+        # Parse the upload stream directly instead of copying it to a temp file first
+        file.file.seek(0)
         
-        # Export preprocessed data
-        output_filename = f"preprocessed_{timestamp}_{file.filename}"
+        # Output location for the preprocessed data
+        output_ext = 'csv.gz' if output_format == 'csv' else output_format
+        output_filename = f"preprocessed_{timestamp}_{Path(file.filename).stem}.{output_ext}"
         output_path = settings.DOWNLOADS_DIR / output_filename
-        df_preprocessed.to_csv(output_path, index=False)
-        
-        logger.info(f"Preprocessed file saved: {output_path}")
         
-        # Clean up temp file
-        try:
-            temp_file_path.unlink()
-        except Exception as e:
-            logger.warning(f"Could not delete temp file: {str(e)}")
+        # Load, preprocess and export off the event loop
+        summary = await asyncio.to_thread(
+            preprocess_file_task, file.file, file_ext, output_path, output_format
+        )
         
         return {
             "status": "success",
             "preprocessed_file": str(output_path),
-            "summary": {
-                "input_rows": original_rows,
-                "input_columns": original_columns,
-                "output_rows": len(df_preprocessed),
-                "output_columns": len(df_preprocessed.columns),
-                "duplicates_removed": preprocessing_summary.get('duplicates_removed', 0),
-                "null_values_standardized": preprocessing_summary.get('null_values_standardized', 0),
-                "type_conversions": preprocessing_summary.get('type_conversions', 0),
-                "detected_types": preprocessing_summary.get('detected_types', {})
-            }
+            "summary": summary
         }
     
     except HTTPException:
@@ -247,4 +213,40 @@ async def preprocess_data(
         raise HTTPException(
             status_code=500,
             detail=f"Preprocessing failed: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+def preprocess_file_task(file_obj: BinaryIO, file_ext: str, output_path: Path, output_format: str) -> Dict[str, Any]:
+    """Blocking load + preprocess + export for /preprocess, run in a worker thread"""
+    # Load CSV
+    if file_ext == '.csv':
+        df = pd.read_csv(file_obj)
+    else:
+        df = pd.read_excel(file_obj)
+    original_rows = len(df)
+    original_columns = len(df.columns)
+    
+    logger.info(f"Loaded CSV: {original_rows} rows, {original_columns} columns")
+    
+    # Preprocess
+    df_preprocessed, preprocessing_summary = DataTransformService._preprocess(df)
+    
+    if output_format == 'parquet':
+        df_preprocessed.to_parquet(output_path, engine='pyarrow', compression='zstd', index=False)
+    else:
+        df_preprocessed.to_csv(output_path, index=False, compression='gzip')
+    
+    logger.info(f"Preprocessed file saved: {output_path}")
+    
+    return {
+        "input_rows": original_rows,
+        "input_columns": original_columns,
+        "output_rows": len(df_preprocessed),
+        "output_columns": len(df_preprocessed.columns),
+        "output_format": output_format,
+        "output_bytes": output_path.stat().st_size,
+        "duplicates_removed": preprocessing_summary.get('duplicates_removed', 0),
+        "null_values_standardized": preprocessing_summary.get('null_values_standardized', 0),
+        "type_conversions": preprocessing_summary.get('type_conversions', 0),
+        "detected_types": preprocessing_summary.get('detected_types', {})
+    }
@@ -1,18 +1,51 @@
+import os
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Union, BinaryIO
 import json
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from etl_service.utils.type_detector import TypeDetector
-from etl_service.utils.data_cleaner import DataCleaner
+from etl_service.utils.data_cleaner import DataCleaner, _EXTRA_WS_RE, _special_re
 from etl_service.utils.formula_parser import FormulaParser
 from etl_service.utils.logger import get_logger
 from etl_service.config import settings
 
 logger = get_logger(__name__)
 
+# Accepted boolean tokens, matched with vectorized isin instead of a per-cell dict lookup
+_TRUE = frozenset({'true', 'True', 'TRUE', '1', 1, 'yes', 'Yes', True})
+_FALSE = frozenset({'false', 'False', 'FALSE', '0', 0, 'no', 'No', False})
+
+
+def _string_transform(op):
+    """Wrap a Series.str operation so non-string values pass through unchanged"""
+    def apply(series: pd.Series) -> pd.Series:
+        if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+            return series
+        try:
+            result = op(series.str)
+        except AttributeError:
+            # Object column without any string values
+            return series
+        return result.where(result.notna(), series)
+    return apply
+
+
+# Column transformations, applied as vectorized string ops in the order requested
+_TRANSFORMS = {
+    'trim': _string_transform(lambda s: s.strip()),
+    'uppercase': _string_transform(lambda s: s.upper()),
+    'lowercase': _string_transform(lambda s: s.lower()),
+    'title_case': _string_transform(lambda s: s.title()),
+    'remove_special_chars': _string_transform(lambda s: s.replace(_special_re(''), '', regex=True)),
+    'remove_extra_spaces': _string_transform(lambda s: s.replace(_EXTRA_WS_RE, ' ', regex=True).str.strip()),
+}
+
 
 class DataTransformService:
     """
@@ -26,19 +59,19 @@ class DataTransformService:
     """
 
     @staticmethod
-    def transform_data(csv_file_path: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    def transform_data(csv_file_path: Union[str, BinaryIO], schema: Dict[str, Any]) -> Dict[str, Any]:
         """
         Main transformation method
         
         Args:
-            csv_file_path: Path to input CSV file
+            csv_file_path: Path to input CSV file, or an open binary file object
             schema: JSON schema defining transformation rules
         
         Returns:
             Dictionary with output file path and summary
         """
         try:
-            logger.info(f"Starting transformation for: {csv_file_path}")
+            logger.info(f"Starting transformation for: {getattr(csv_file_path, 'name', csv_file_path)}")
             logger.info(f"Schema: {json.dumps(schema, indent=2)}")
             
             # STEP 1: Load CSV
@@ -87,8 +120,8 @@ class DataTransformService:
             raise
 
     @staticmethod
-    def _load_csv(file_path: str) -> pd.DataFrame:
-        """Load CSV file with proper encoding handling"""
+    def _load_csv(file_path: Union[str, BinaryIO]) -> pd.DataFrame:
+        """Load CSV file (path or file object) with proper encoding handling"""
         try:
             # Try UTF-8 first
             df = pd.read_csv(file_path, encoding='utf-8')
@@ -96,6 +129,8 @@ class DataTransformService:
         except UnicodeDecodeError:
             # Fallback to latin-1
             logger.warning("UTF-8 decode failed, trying latin-1")
+            if hasattr(file_path, 'seek'):
+                file_path.seek(0)
             df = pd.read_csv(file_path, encoding='latin-1')
             return df
         except Exception as e:
@@ -140,30 +175,25 @@ class DataTransformService:
         type_conversions = 0
         detected_types = {}
         
-        for col in df.columns:
-            detected_type = TypeDetector.detect_column_type(df[col])
+        # Columns are independent; pandas/NumPy release the GIL for most of this work
+        max_workers = min(32, os.cpu_count() or 4, max(len(df.columns), 1))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(
+                DataTransformService._detect_and_convert,
+                (df.iloc[:, i] for i in range(len(df.columns)))
+            ))
+        
+        converted_columns = {}
+        for i, (col, (detected_type, converted, was_converted)) in enumerate(zip(df.columns, results)):
             detected_types[col] = detected_type
-            
-            # Convert to detected type
-            try:
-                if detected_type == 'integer':
-                    df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype('Int64')
-                    type_conversions += 1
-                elif detected_type == 'float':
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-                    type_conversions += 1
-                elif detected_type == 'date':
-                    date_format = TypeDetector.detect_date_format(df[col])
-                    df[col] = pd.to_datetime(df[col], format=date_format, errors='coerce')
-                    type_conversions += 1
-                elif detected_type == 'boolean':
-                    df[col] = df[col].map({
-                        'true': True, 'True': True, 'TRUE': True, '1': True, 'yes': True, 'Yes': True,
-                        'false': False, 'False': False, 'FALSE': False, '0': False, 'no': False, 'No': False
-                    })
-                    type_conversions += 1
-            except Exception as e:
-                logger.warning(f"Could not convert column {col} to {detected_type}: {str(e)}")
+            converted_columns[i] = converted
+            if was_converted:
+                type_conversions += 1
+        
+        # Build positionally so duplicate column names survive, then restore the labels
+        converted_df = pd.DataFrame(converted_columns, index=df.index, copy=False)
+        converted_df.columns = df.columns
+        df = converted_df
         
         summary['type_conversions'] = type_conversions
         summary['detected_types'] = detected_types
@@ -171,6 +201,49 @@ class DataTransformService:
         
         return df, summary
 
+    @staticmethod
+    def _detect_and_convert(series: pd.Series) -> Tuple[str, pd.Series, bool]:
+        """
+        Detect the type of a single column and convert it
+        
+        Returns: (detected_type, converted_series, whether a conversion was applied)
+        """
+        # Columns the parser already typed need no detection
+        if pd.api.types.is_bool_dtype(series):
+            return 'boolean', series, False
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return 'date', series, False
+        if pd.api.types.is_integer_dtype(series):
+            return 'integer', series, False
+        if pd.api.types.is_float_dtype(series):
+            # Integer columns with missing values are parsed as float
+            values = series.dropna()
+            if len(values) > 0 and (values % 1 == 0).all():
+                try:
+                    return 'integer', series.astype('Int64'), True
+                except (TypeError, ValueError, OverflowError):
+                    # Whole numbers beyond the int64 range stay float
+                    pass
+            return 'float', series, False
+        
+        detected_type = TypeDetector.detect_column_type(series)
+        
+        try:
+            if detected_type == 'integer':
+                # Nullable Int64 keeps missing values as NA, no fill pass needed
+                return detected_type, pd.to_numeric(series, errors='coerce').astype('Int64'), True
+            elif detected_type == 'float':
+                return detected_type, pd.to_numeric(series, errors='coerce'), True
+            elif detected_type == 'date':
+                date_format = TypeDetector.detect_date_format(series)
+                return detected_type, pd.to_datetime(series, format=date_format, errors='coerce'), True
+            elif detected_type == 'boolean':
+                return detected_type, DataTransformService._to_boolean(series), True
+        except Exception as e:
+            logger.warning(f"Could not convert column {series.name} to {detected_type}: {str(e)}")
+        
+        return detected_type, series, False
+
     @staticmethod
     def _apply_schema(df: pd.DataFrame, schema: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """
@@ -208,7 +281,8 @@ class DataTransformService:
             'rows_skipped': 0
         }
         
-        result_df = pd.DataFrame()
+        # Collect columns first and build the frame once, avoiding repeated block reallocation
+        columns_data: Dict[str, pd.Series] = {}
         
         # Process each column in schema
         if 'columns' in schema:
@@ -247,11 +321,13 @@ class DataTransformService:
                     col_data = col_data.fillna(col_config['default_value'])
                 
                 # Add to result
-                result_df[target_col] = col_data
+                columns_data[target_col] = col_data
                 
                 if target_col != source_col:
                     summary['columns_renamed'] += 1
         
+        result_df = pd.DataFrame(columns_data, copy=False)
+        
         # Add calculated columns
         if 'calculated_columns' in schema:
             for calc_col in schema['calculated_columns']:
@@ -284,11 +360,15 @@ class DataTransformService:
         original_row_count = len(result_df)
         
         if 'columns' in schema:
-            for col_config in schema['columns']:
-                if col_config.get('required', False):
-                    target_col = col_config.get('target_column', col_config.get('source_column'))
-                    if target_col in result_df.columns:
-                        result_df = result_df.dropna(subset=[target_col])
+            required_cols = [
+                target_col
+                for col_config in schema['columns']
+                if col_config.get('required', False)
+                for target_col in [col_config.get('target_column', col_config.get('source_column'))]
+                if target_col in result_df.columns
+            ]
+            if required_cols:
+                result_df = result_df.dropna(subset=required_cols)
         
         summary['rows_skipped'] = original_row_count - len(result_df)
         
@@ -313,10 +393,7 @@ class DataTransformService:
                 return pd.to_datetime(series, format=date_format, errors='coerce')
             
             elif data_type == 'boolean':
-                return series.map({
-                    'true': True, 'True': True, 'TRUE': True, '1': True, 1: True, 'yes': True,
-                    'false': False, 'False': False, 'FALSE': False, '0': False, 0: False, 'no': False
-                })
+                return DataTransformService._to_boolean(series)
             
             return series
         
@@ -324,22 +401,22 @@ class DataTransformService:
             logger.warning(f"Type conversion to {data_type} failed: {str(e)}")
             return series
 
+    @staticmethod
+    def _to_boolean(series: pd.Series) -> pd.Series:
+        """Convert series to nullable boolean; unrecognised values become NA"""
+        values = np.where(
+            series.isin(_TRUE), True,
+            np.where(series.isin(_FALSE), False, pd.NA)
+        )
+        return pd.Series(values, index=series.index, dtype='boolean')
+
     @staticmethod
     def _apply_transformations(series: pd.Series, transformations: List[str]) -> pd.Series:
         """Apply list of transformations to a series"""
         for transform in transformations:
-            if transform == 'trim':
-                series = series.apply(lambda x: x.strip() if isinstance(x, str) else x)
-            elif transform == 'uppercase':
-                series = series.apply(lambda x: x.upper() if isinstance(x, str) else x)
-            elif transform == 'lowercase':
-                series = series.apply(lambda x: x.lower() if isinstance(x, str) else x)
-            elif transform == 'title_case':
-                series = series.apply(lambda x: x.title() if isinstance(x, str) else x)
-            elif transform == 'remove_special_chars':
-                series = series.apply(lambda x: DataCleaner.remove_special_characters(x) if isinstance(x, str) else x)
-            elif transform == 'remove_extra_spaces':
-                series = series.apply(lambda x: DataCleaner.remove_extra_spaces(x) if isinstance(x, str) else x)
+            transform_fn = _TRANSFORMS.get(transform)
+            if transform_fn:
+                series = transform_fn(series)
         
         return series
 
@@ -362,7 +439,8 @@ class DataTransformService:
         
         elif output_format == 'parquet':
             output_path = settings.DOWNLOADS_DIR / f"{table_name}_{timestamp}.parquet"
-            df.to_parquet(output_path, index=False)
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            pq.write_table(table, output_path, compression='zstd')
         
         else:
             # Default to CSV
@@ -1,8 +1,21 @@
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 import re
+from functools import lru_cache
 from typing import Any
 
+# Common NULL representations, matched exactly, or empty / whitespace-only strings (use with fullmatch)
+_NULL_RE = re.compile(r'-|null|NULL|N/A|n/a|NA|None|none|\s*')
+_EXTRA_WS_RE = re.compile(r'\s+')
+_CURRENCY_RE = re.compile(r'[₹$€£,]')
+
+
+@lru_cache(maxsize=32)
+def _special_re(keep_chars: str) -> re.Pattern:
+    """Compiled pattern matching everything except alphanumerics, spaces and keep_chars"""
+    return re.compile(f'[^a-zA-Z0-9{re.escape(keep_chars)} ]')
+
 
 class DataCleaner:
     """
@@ -15,14 +28,9 @@ class DataCleaner:
         Replace common NULL representations with actual NULL
         Handles: '-', '', ' ', 'null', 'NULL', 'N/A', 'n/a', etc.
         """
-        null_representations = ['-', '', ' ', 'null', 'NULL', 'N/A', 'n/a', 'NA', 'None', 'none']
-        
-        # Replace all null representations with NaN
-        df = df.replace(null_representations, np.nan)
-        
-        # Also handle whitespace-only strings
+        # One regex sweep per string column covers both the tokens and whitespace-only values
         for col in df.select_dtypes(include=['object']).columns:
-            df[col] = df[col].apply(lambda x: np.nan if isinstance(x, str) and x.strip() == '' else x)
+            df[col] = df[col].mask(df[col].astype(str).str.fullmatch(_NULL_RE), np.nan)
         
         return df
 
@@ -46,8 +54,7 @@ class DataCleaner:
             return value
         
         # Keep alphanumeric and specified characters
-        pattern = f'[^a-zA-Z0-9{re.escape(keep_chars)} ]'
-        return re.sub(pattern, '', value)
+        return _special_re(keep_chars).sub('', value)
 
     @staticmethod
     def remove_line_endings(df: pd.DataFrame) -> pd.DataFrame:
@@ -93,12 +100,32 @@ class DataCleaner:
         if subset:
             df_clean = df.drop_duplicates(subset=subset, keep='first')
         else:
-            df_clean = df.drop_duplicates(keep='first')
+            df_clean = DataCleaner._drop_duplicate_rows(df)
         
         duplicates_removed = original_count - len(df_clean)
         
         return df_clean, duplicates_removed
 
+    @staticmethod
+    def _drop_duplicate_rows(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Full-row duplicate removal using an Arrow hash group-by
+        Keeps the first occurrence; falls back to pandas for frames Arrow can't convert
+        """
+        if len(df.columns) == 0:
+            return df.drop_duplicates(keep='first')
+        
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            key_columns = table.column_names
+            table = table.append_column('__row_id__', pa.array(np.arange(len(df), dtype=np.int64)))
+            first_rows = table.group_by(key_columns).aggregate([('__row_id__', 'min')])
+        except (ValueError, pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            return df.drop_duplicates(keep='first')
+        
+        keep_idx = np.sort(first_rows['__row_id___min'].to_numpy())
+        return df.iloc[keep_idx]
+
     @staticmethod
     def remove_extra_spaces(value: Any) -> Any:
         """
@@ -107,7 +134,7 @@ class DataCleaner:
         if pd.isna(value) or not isinstance(value, str):
             return value
         
-        return re.sub(r'\s+', ' ', value).strip()
+        return _EXTRA_WS_RE.sub(' ', value).strip()
 
     @staticmethod
     def clean_numeric_strings(value: Any) -> Any:
@@ -118,10 +145,7 @@ class DataCleaner:
         if pd.isna(value):
             return value
         
-        value_str = str(value).strip()
-        
-        # Remove currency symbols and commas
-        value_str = re.sub(r'[₹$€£,]', '', value_str)
+        value_str = _CURRENCY_RE.sub('', str(value).strip())
         
         # Try to convert to float
         try:
@@ -129,13 +153,22 @@ class DataCleaner:
         except (ValueError, TypeError):
             return value
 
+    @staticmethod
+    def clean_numeric_series(series: pd.Series) -> pd.Series:
+        """
+        Vectorized clean_numeric_strings for a whole column
+        Removes currency symbols and commas, then converts to numeric (unparseable -> NaN)
+        """
+        cleaned = series.astype('string').str.strip().str.replace(_CURRENCY_RE, '', regex=True)
+        return pd.to_numeric(cleaned, errors='coerce')
+
     @staticmethod
     def validate_numeric_range(series: pd.Series, min_val: float = None, max_val: float = None) -> pd.Series:
         """
         Flag values outside the specified range
         Returns boolean series indicating valid values
         """
-        valid = pd.Series([True] * len(series))
+        valid = pd.Series(np.ones(len(series), dtype=bool), index=series.index)
         
         if min_val is not None:
             valid &= (series >= min_val) | series.isna()
@@ -151,22 +184,31 @@ class DataCleaner:
         Detect outliers using IQR or Z-score method
         Returns boolean series indicating non-outliers
         """
-        if method == 'iqr':
-            Q1 = series.quantile(0.25)
-            Q3 = series.quantile(0.75)
-            IQR = Q3 - Q1
-            
-            lower_bound = Q1 - threshold * IQR
-            upper_bound = Q3 + threshold * IQR
-            
-            return (series >= lower_bound) & (series <= upper_bound) | series.isna()
-        
-        elif method == 'zscore':
-            mean = series.mean()
-            std = series.std()
-            
-            z_scores = np.abs((series - mean) / std)
+        if method not in ('iqr', 'zscore'):
+            return pd.Series(np.ones(len(series), dtype=bool), index=series.index)
+        
+        # Work on a single float64 buffer instead of chaining pandas ops
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        is_null = np.isnan(values)
+        
+        if is_null.all():
+            return pd.Series(np.ones(len(series), dtype=bool), index=series.index)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if method == 'iqr':
+                # np.nanquantile selects via partitioning rather than a full sort
+                Q1, Q3 = np.nanquantile(values, [0.25, 0.75])
+                IQR = Q3 - Q1
+                
+                lower_bound = Q1 - threshold * IQR
+                upper_bound = Q3 + threshold * IQR
+                
+                inliers = (values >= lower_bound) & (values <= upper_bound)
             
-            return (z_scores <= threshold) | series.isna()
+            else:
+                mean = np.nanmean(values)
+                std = np.nanstd(values, ddof=1)
+                
+                inliers = np.abs((values - mean) / std) <= threshold
         
-        return pd.Series([True] * len(series))
\ No newline at end of file
+        return pd.Series(inliers | is_null, index=series.index)
\ No newline at end of file
@@ -1,7 +1,38 @@
+import ast
+import numexpr
 import pandas as pd
 import numpy as np
 import re
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet
+
+# Single scan for every supported function call; case-insensitive, no .upper() copy
+_FUNCTION_RE = re.compile(r'\b(IF|SUM|AVG|MIN|MAX|ABS|ROUND)\s*\(', re.IGNORECASE)
+
+# Identifiers that are formula keywords rather than column references (validate_formula)
+_IDENTIFIER_RE = re.compile(r'\b[a-zA-Z_][a-zA-Z0-9_]*\b')
+_KEYWORDS = frozenset({'IF', 'SUM', 'AVG', 'MIN', 'MAX', 'ABS', 'ROUND', 'AND', 'OR', 'NOT'})
+
+
+class CompiledFormula:
+    """
+    A formula parsed once into a callable over a dataframe
+    """
+
+    def __init__(self, formula: str, evaluator: Callable[[pd.DataFrame], pd.Series]):
+        self.formula = formula
+        self._evaluator = evaluator
+
+    def __call__(self, df: pd.DataFrame) -> pd.Series:
+        return self._evaluator(df)
+
+    def evaluate(self, df: pd.DataFrame) -> pd.Series:
+        """Evaluate against df, returning an all-NaN series on failure"""
+        try:
+            return self._evaluator(df)
+        except Exception as e:
+            print(f"Error evaluating formula '{self.formula}': {str(e)}")
+            return pd.Series(np.full(len(df), np.nan, dtype=np.float64), index=df.index)
 
 
 class FormulaParser:
@@ -23,27 +54,120 @@ class FormulaParser:
         - "price * quantity"
         - "received_qty - returned_qty"
         - "IF(tax > 0, price * (1 + tax/100), price)"
+        
+        The formula is parsed once and cached (see compile_formula); repeated
+        calls only run the evaluation.
         """
         try:
-            # Handle IF statements first
-            if 'IF(' in formula.upper():
-                return FormulaParser._evaluate_if_statement(df, formula)
+            compiled = FormulaParser.compile_formula(formula)
+        except Exception as e:
+            print(f"Error evaluating formula '{formula}': {str(e)}")
+            return pd.Series(np.full(len(df), np.nan, dtype=np.float64), index=df.index)
+        
+        return compiled.evaluate(df)
+
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def compile_formula(formula: str) -> 'CompiledFormula':
+        """
+        Parse a formula into a CompiledFormula
+        
+        All regex extraction (IF / ROUND / ABS / aggregations) happens here,
+        so evaluating the result only dispatches to pandas.
+        """
+        functions = frozenset(match.group(1).upper() for match in _FUNCTION_RE.finditer(formula))
+        
+        # Handle IF statements first
+        if 'IF' in functions:
+            return FormulaParser._compile_if_statement(formula)
+        
+        # Handle functions
+        if functions:
+            return FormulaParser._compile_functions(formula, functions)
+        
+        # Simple arithmetic evaluation
+        return CompiledFormula(formula, FormulaParser._compile_expression(formula))
+
+    @staticmethod
+    def _numexpr_evaluator(expression: str) -> Callable[[pd.DataFrame], pd.Series]:
+        """
+        Build a numexpr evaluator over the columns referenced by expression
+        
+        Raises SyntaxError if the expression can't be parsed; the returned
+        callable raises if numexpr can't evaluate it for a given dataframe.
+        """
+        tree = ast.parse(expression.strip(), mode='eval')
+        function_names = {
+            node.func.id for node in ast.walk(tree)
+            if isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+        }
+        names = sorted({
+            node.id for node in ast.walk(tree) if isinstance(node, ast.Name)
+        } - function_names)
+        
+        def evaluate(df: pd.DataFrame) -> pd.Series:
+            local_dict = {}
+            for name in names:
+                column = df[name]
+                if pd.api.types.is_extension_array_dtype(column) and pd.api.types.is_numeric_dtype(column):
+                    # Nullable Int64/Float64: hand numexpr a plain float buffer
+                    local_dict[name] = column.to_numpy(dtype=np.float64, na_value=np.nan)
+                else:
+                    local_dict[name] = column.to_numpy()
             
-            # Handle functions
-            if any(func in formula.upper() for func in ['SUM', 'AVG', 'MIN', 'MAX', 'ABS', 'ROUND']):
-                return FormulaParser._evaluate_functions(df, formula)
+            result = numexpr.evaluate(expression, local_dict=local_dict, global_dict={})
             
-            # Simple arithmetic evaluation using pandas eval
-            return df.eval(formula)
+            if np.ndim(result) == 0:
+                result = np.full(len(df), result)
+            return pd.Series(result, index=df.index)
         
+        return evaluate
+
+    @staticmethod
+    def _compile_expression(expression: str) -> Callable[[pd.DataFrame], pd.Series]:
+        """
+        Compile a plain arithmetic/comparison expression
+        
+        Runs numexpr directly on the referenced columns' arrays, skipping the
+        resolver/AST overhead of df.eval. Falls back to df.eval for anything
+        numexpr can't handle (unknown names, object columns, python keywords).
+        """
+        try:
+            fast_path = FormulaParser._numexpr_evaluator(expression)
+        except SyntaxError:
+            return lambda df: df.eval(expression)
+        
+        def evaluate(df: pd.DataFrame) -> pd.Series:
+            try:
+                return fast_path(df)
+            except Exception:
+                return df.eval(expression)
+        
+        return evaluate
+
+    @staticmethod
+    def _compile_branch(value: str) -> Callable[[pd.DataFrame], Any]:
+        """Compile an IF branch: numeric literal or nested formula"""
+        if value.replace('.', '').isdigit():
+            literal = float(value)
+            return lambda df: literal
+        
+        try:
+            branch = FormulaParser.compile_formula(value)
         except Exception as e:
-            print(f"Error evaluating formula '{formula}': {str(e)}")
-            return pd.Series([np.nan] * len(df))
+            error = str(e)
+            
+            def failed(df: pd.DataFrame) -> pd.Series:
+                print(f"Error evaluating formula '{value}': {error}")
+                return pd.Series(np.full(len(df), np.nan, dtype=np.float64), index=df.index)
+            return failed
+        
+        return branch.evaluate
 
     @staticmethod
-    def _evaluate_if_statement(df: pd.DataFrame, formula: str) -> pd.Series:
+    def _compile_if_statement(formula: str) -> 'CompiledFormula':
         """
-        Evaluate IF(condition, true_value, false_value) statements
+        Compile IF(condition, true_value, false_value) statements
         
         Example: IF(tax > 0, price * 1.05, price)
         """
@@ -54,87 +178,81 @@ class FormulaParser:
         if not match:
             raise ValueError(f"Invalid IF statement: {formula}")
         
-        condition = match.group(1).strip()
-        true_value = match.group(2).strip()
-        false_value = match.group(3).strip()
+        condition_expr = match.group(1).strip()
+        true_expr = match.group(2).strip()
+        false_expr = match.group(3).strip()
         
-        # Evaluate condition
-        condition_result = df.eval(condition)
+        condition = FormulaParser._compile_expression(condition_expr)
+        true_branch = FormulaParser._compile_branch(true_expr)
+        false_branch = FormulaParser._compile_branch(false_expr)
         
-        # Evaluate true and false branches
-        true_result = FormulaParser.evaluate_formula(df, true_value) if not true_value.replace('.','').isdigit() else float(true_value)
-        false_result = FormulaParser.evaluate_formula(df, false_value) if not false_value.replace('.','').isdigit() else float(false_value)
+        # Plain-arithmetic IFs fuse into one numexpr where(): a single blocked,
+        # multi-threaded pass instead of three full-size temporaries + np.where
+        fused = None
+        if not any(_FUNCTION_RE.search(part) for part in (condition_expr, true_expr, false_expr)):
+            try:
+                fused = FormulaParser._numexpr_evaluator(f'where({condition_expr}, {true_expr}, {false_expr})')
+            except SyntaxError:
+                fused = None
         
-        # Apply condition
-        return pd.Series(np.where(condition_result, true_result, false_result))
+        def evaluate(df: pd.DataFrame) -> pd.Series:
+            if fused is not None:
+                try:
+                    return fused(df)
+                except Exception:
+                    pass
+            
+            # Evaluate condition and both branches, then apply condition
+            condition_result = condition(df)
+            return pd.Series(np.where(condition_result, true_branch(df), false_branch(df)), index=df.index)
+        
+        return CompiledFormula(formula, evaluate)
 
     @staticmethod
-    def _evaluate_functions(df: pd.DataFrame, formula: str) -> pd.Series:
-        """
-        Evaluate functions like SUM, AVG, MIN, MAX, ABS, ROUND
+    def _compile_functions(formula: str, functions: FrozenSet[str]) -> 'CompiledFormula':
         """
-        formula_upper = formula.upper()
+        Compile functions like SUM, AVG, MIN, MAX, ABS, ROUND
         
+        functions: upper-cased function names found in the formula
+        """
         # ROUND(column, decimals)
-        if 'ROUND(' in formula_upper:
+        if 'ROUND' in functions:
             pattern = r'ROUND\s*\(\s*([^,]+)\s*,\s*(\d+)\s*\)'
             match = re.search(pattern, formula, re.IGNORECASE)
             if match:
-                col_expr = match.group(1).strip()
+                # Compile the expression inside ROUND
+                inner = FormulaParser.compile_formula(match.group(1).strip())
                 decimals = int(match.group(2))
-                
-                # Evaluate the expression inside ROUND
-                result = FormulaParser.evaluate_formula(df, col_expr)
-                return result.round(decimals)
+                return CompiledFormula(formula, lambda df: inner.evaluate(df).round(decimals))
         
         # ABS(column)
-        if 'ABS(' in formula_upper:
+        if 'ABS' in functions:
             pattern = r'ABS\s*\(\s*([^)]+)\s*\)'
             match = re.search(pattern, formula, re.IGNORECASE)
             if match:
-                col_expr = match.group(1).strip()
-                result = FormulaParser.evaluate_formula(df, col_expr)
-                return result.abs()
+                inner = FormulaParser.compile_formula(match.group(1).strip())
+                return CompiledFormula(formula, lambda df: inner.evaluate(df).abs())
         
         # For aggregation functions, return scalar applied to all rows
-        # SUM(column)
-        if 'SUM(' in formula_upper:
-            pattern = r'SUM\s*\(\s*([^)]+)\s*\)'
-            match = re.search(pattern, formula, re.IGNORECASE)
-            if match:
-                col_name = match.group(1).strip()
-                total = df[col_name].sum()
-                return pd.Series([total] * len(df))
-        
-        # AVG(column)
-        if 'AVG(' in formula_upper:
-            pattern = r'AVG\s*\(\s*([^)]+)\s*\)'
-            match = re.search(pattern, formula, re.IGNORECASE)
-            if match:
-                col_name = match.group(1).strip()
-                avg = df[col_name].mean()
-                return pd.Series([avg] * len(df))
-        
-        # MIN(column)
-        if 'MIN(' in formula_upper:
-            pattern = r'MIN\s*\(\s*([^)]+)\s*\)'
-            match = re.search(pattern, formula, re.IGNORECASE)
-            if match:
-                col_name = match.group(1).strip()
-                minimum = df[col_name].min()
-                return pd.Series([minimum] * len(df))
-        
-        # MAX(column)
-        if 'MAX(' in formula_upper:
-            pattern = r'MAX\s*\(\s*([^)]+)\s*\)'
-            match = re.search(pattern, formula, re.IGNORECASE)
-            if match:
-                col_name = match.group(1).strip()
-                maximum = df[col_name].max()
-                return pd.Series([maximum] * len(df))
+        aggregations = [
+            ('SUM', lambda col: col.sum()),
+            ('AVG', lambda col: col.mean()),
+            ('MIN', lambda col: col.min()),
+            ('MAX', lambda col: col.max()),
+        ]
+        for func_name, aggregate in aggregations:
+            if func_name in functions:
+                pattern = func_name + r'\s*\(\s*([^)]+)\s*\)'
+                match = re.search(pattern, formula, re.IGNORECASE)
+                if match:
+                    col_name = match.group(1).strip()
+                    return CompiledFormula(
+                        formula,
+                        lambda df, col_name=col_name, aggregate=aggregate: pd.Series([aggregate(df[col_name])] * len(df))
+                    )
         
         # If no function matched, try simple eval
-        return df.eval(formula)
+        return CompiledFormula(formula, FormulaParser._compile_expression(formula))
 
     @staticmethod
     def validate_formula(df: pd.DataFrame, formula: str) -> tuple:
@@ -145,12 +263,12 @@ class FormulaParser:
         try:
             # Check if columns referenced in formula exist
             # Extract potential column names (simple heuristic)
-            potential_cols = re.findall(r'\b[a-zA-Z_][a-zA-Z0-9_]*\b', formula)
+            potential_cols = _IDENTIFIER_RE.findall(formula)
+            df_cols = set(df.columns)
             
             for col in potential_cols:
-                if col.upper() not in ['IF', 'SUM', 'AVG', 'MIN', 'MAX', 'ABS', 'ROUND', 'AND', 'OR', 'NOT']:
-                    if col not in df.columns:
-                        return False, f"Column '{col}' not found in dataframe"
+                if col not in df_cols and col.upper() not in _KEYWORDS:
+                    return False, f"Column '{col}' not found in dataframe"
             
             # Try to evaluate
             result = FormulaParser.evaluate_formula(df.head(5), formula)
@@ -1,7 +1,9 @@
 import pandas as pd
 import numpy as np
-from datetime import datetime
-from typing import Any, List
+from functools import lru_cache
+from typing import Tuple
+
+_BOOL_TOKENS = frozenset({'true', 'false', '0', '1', 'yes', 'no', 't', 'f', 'y', 'n'})
 
 
 class TypeDetector:
@@ -9,64 +11,17 @@ class TypeDetector:
     Utility class to automatically detect data types of columns
     """
 
-    @staticmethod
-    def is_integer(value: Any) -> bool:
-        """Check if value can be converted to integer"""
-        if pd.isna(value) or value in [None, '', '-', ' ']:
-            return True  # NULLs are acceptable
-        try:
-            float_val = float(str(value).strip())
-            return float_val == int(float_val)
-        except (ValueError, TypeError):
-            return False
-
-    @staticmethod
-    def is_float(value: Any) -> bool:
-        """Check if value can be converted to float"""
-        if pd.isna(value) or value in [None, '', '-', ' ']:
-            return True  # NULLs are acceptable
-        try:
-            float(str(value).strip())
-            return True
-        except (ValueError, TypeError):
-            return False
-
-    @staticmethod
-    def is_date(value: Any) -> bool:
-        """Check if value can be converted to date"""
-        if pd.isna(value) or value in [None, '', '-', ' ']:
-            return True  # NULLs are acceptable
-        
-        value_str = str(value).strip()
-        
-        # Common date formats
-        date_formats = [
-            '%d/%m/%Y',
-            '%d-%m-%Y',
-            '%Y-%m-%d',
-            '%Y/%m/%d',
-            '%m/%d/%Y',
-            '%d.%m.%Y',
-            '%d %b %Y',
-            '%d %B %Y'
-        ]
-        
-        for fmt in date_formats:
-            try:
-                datetime.strptime(value_str, fmt)
-                return True
-            except (ValueError, TypeError):
-                continue
-        return False
-
-    @staticmethod
-    def is_boolean(value: Any) -> bool:
-        """Check if value is boolean"""
-        if pd.isna(value) or value in [None, '', '-', ' ']:
-            return True
-        
-        value_str = str(value).strip().lower()
-        return value_str in ['true', 'false', '0', '1', 'yes', 'no', 't', 'f', 'y', 'n']
+    # Common date formats
+    DATE_FORMATS = [
+        '%d/%m/%Y',
+        '%d-%m-%Y',
+        '%Y-%m-%d',
+        '%Y/%m/%d',
+        '%m/%d/%Y',
+        '%d.%m.%Y',
+        '%d %b %Y',
+        '%d %B %Y'
+    ]
 
     @staticmethod
     def detect_column_type(series: pd.Series) -> str:
@@ -86,21 +41,40 @@ class TypeDetector:
         sample_size = min(1000, len(clean_series))
         sample = clean_series.head(sample_size)
         
+        # Detection depends only on the sampled values, so repeated batches of the
+        # same source hit the cache instead of re-probing
+        sample_str = sample.astype(str).str.strip()
+        return TypeDetector._detect_sample_type(tuple(sample_str))
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _detect_sample_type(sample_values: Tuple[str, ...]) -> str:
+        """
+        Detect the type of a (stripped, non-null) string sample
+        Cached on the sample contents
+        """
+        # Vectorized checks: one C-level pass per candidate type instead of per-value Python calls
+        sample_str = pd.Series(sample_values, dtype=object)
+        
         # Try Boolean first (most restrictive)
-        if all(TypeDetector.is_boolean(v) for v in sample):
+        if sample_str.str.lower().isin(_BOOL_TOKENS).all():
             return 'boolean'
         
-        # Try Integer
-        if all(TypeDetector.is_integer(v) for v in sample):
-            return 'integer'
-        
-        # Try Float
-        if all(TypeDetector.is_float(v) for v in sample):
+        numeric = pd.to_numeric(sample_str, errors='coerce')
+        if numeric.notna().all():
+            # Try Integer
+            if (numeric % 1 == 0).all():
+                return 'integer'
+            
+            # Try Float
             return 'float'
         
-        # Try Date
-        if all(TypeDetector.is_date(v) for v in sample):
-            return 'date'
+        # Try Date (every value must match at least one known format)
+        parsed = np.zeros(len(sample_str), dtype=bool)
+        for fmt in TypeDetector.DATE_FORMATS:
+            parsed |= pd.to_datetime(sample_str, format=fmt, errors='coerce', cache=True).notna().to_numpy()
+            if parsed.all():
+                return 'date'
         
         # Default to String
         return 'string'
@@ -126,22 +100,14 @@ class TypeDetector:
             '%d.%m.%Y'
         ]
         
-        sample = clean_series.head(100)
+        sample = clean_series.head(100).astype(str).str.strip()
         
         for fmt in date_formats:
-            try:
-                success_count = 0
-                for val in sample:
-                    try:
-                        datetime.strptime(str(val).strip(), fmt)
-                        success_count += 1
-                    except:
-                        pass
-                
-                # If more than 80% match, consider it the format
-                if success_count / len(sample) > 0.8:
-                    return fmt
-            except:
-                continue
-        
-        return '%d/%m/%Y'  # Default fallback
\ No newline at end of file
+            # pandas' C parser skips non-matching values without raising per value
+            parsed = pd.to_datetime(sample, format=fmt, errors='coerce', cache=True)
+            
+            # If more than 80% match, consider it the format
+            if parsed.notna().sum() / len(sample) > 0.8:
+                return fmt
+        
+        return '%d/%m/%Y'  # Default fallback
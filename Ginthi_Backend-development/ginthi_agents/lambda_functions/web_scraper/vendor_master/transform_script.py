@@ -1,8 +1,9 @@
 import os
-import json
+import orjson
 import boto3
 import pandas as pd
-from io import StringIO
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from botocore.exceptions import NoCredentialsError, ClientError
 from dotenv import load_dotenv
@@ -67,36 +68,29 @@ print(f"✅ Found {len(csv_keys)} CSV file(s). Combining...")
 # -------------------------------------------------
 # Step 3: Combine and Clean CSV Data
 # -------------------------------------------------
-all_data = []
-
-for key in csv_keys:
+def fetch_and_parse(key):
+    """Download one CSV from S3 and parse it; returns None for unusable files"""
     try:
         obj = s3.get_object(Bucket=BUCKET_NAME, Key=key)
-        csv_str = obj["Body"].read().decode("utf-8")
+        csv_bytes = obj["Body"].read()
 
         # Skip invalid or empty files
-        if "NO DATA FOUND FOR THIS QUERY" in csv_str or not csv_str.strip():
+        if b"NO DATA FOUND FOR THIS QUERY" in csv_bytes or not csv_bytes.strip():
             print(f"⚠️ Skipping invalid or empty file: {key}")
-            continue
-
-        df = pd.read_csv(StringIO(csv_str))
-
-         # Ensure data_version exists and is numeric
-        if "data_version" not in df.columns:
-            df["data_version"] = datetime.now().timestamp()  # unique per file
-            print(f"🕒 Added 'data_version' to file: {key}")
+            return None
 
-        else:
-            # Coerce invalid values to numeric timestamps
-            df["data_version"] = pd.to_numeric(df["data_version"], errors="coerce")
-            missing_mask = df["data_version"].isna()
-            if missing_mask.any():
-                df.loc[missing_mask, "data_version"] = datetime.now().timestamp()
-                print(f"🕒 Filled missing 'data_version' values in file: {key}")
-        all_data.append(df)
+        # Arrow-backed parsing: string columns share contiguous buffers instead of PyObjects
+        df = pd.read_csv(BytesIO(csv_bytes), encoding="utf-8", engine="pyarrow", dtype_backend="pyarrow")
+        return df
 
     except Exception as e:
         print(f"❌ Error reading {key}: {e}")
+        return None
+
+
+# S3 reads are I/O-bound (boto3 releases the GIL on socket reads), so fetch in parallel
+with ThreadPoolExecutor(max_workers=16) as executor:
+    all_data = [df for df in executor.map(fetch_and_parse, csv_keys) if df is not None]
 
 if not all_data:
     raise ValueError("❌ No valid CSV data found in S3 files.")
@@ -113,23 +107,21 @@ print(f"📊 Combined shape before cleaning: {combined_df.shape}")
 if "Vendor Code" not in combined_df.columns:
     raise Exception("❌ 'Vendor Code' column missing in CSVs!")
 
+# Normalize data_version once on the combined frame: files without the column (or with
+# invalid values) are treated as the newest version
+if "data_version" not in combined_df.columns:
+    combined_df["data_version"] = pd.NA
+
 combined_df["data_version"] = (
     pd.to_numeric(combined_df["data_version"], errors="coerce")
-    .fillna(0)
-    .astype(int)
+    .fillna(int(datetime.now().timestamp()))
+    .astype("int64")
 )
 
-# Rank and keep latest data_version per Vendor Code
-combined_df["rank"] = (
-    combined_df.groupby("Vendor Code")["data_version"]
-    .rank(method="first", ascending=False)
-)
+# Keep latest data_version per Vendor Code (first row wins on ties)
+latest_idx = combined_df.groupby("Vendor Code")["data_version"].idxmax()
 
-clean_df = (
-    combined_df[combined_df["rank"] == 1]
-    .drop(columns=["rank"])
-    .reset_index(drop=True)
-)
+clean_df = combined_df.loc[latest_idx.sort_values()].reset_index(drop=True)
 
 print(f"✅ After deduplication: {clean_df.shape}")
 print(f"📋 Columns: {clean_df.columns.tolist()}")
@@ -137,29 +129,46 @@ print(f"📋 Columns: {clean_df.columns.tolist()}")
 # -------------------------------------------------
 # Step 5: Transform Data → VendorMaster Schema
 # -------------------------------------------------
-vendor_records = []
-
-for _, row in clean_df.iterrows():
-    record = {
-        "vendor_code": str(row.get("Vendor Code") or "").strip() or None,
-        "vendor_name": str(row.get("Supplier Name") or "").strip() or None,
-        "email": str(row.get("Email") or "").strip() or None,
-        "gst_id": str(row.get("GST") or "").strip() or None,
-        "company_pan": str(row.get("PAN") or "").strip() or None,
-        "bank_acc_no": str(row.get("Account Number") or "").strip() or None,
-        "beneficiary_name": str(row.get("Beneficiary") or "").strip() or None,
-        "ifsc_code": str(row.get("IFSC") or "").strip() or None,
-        "payment_term_days": (
-            int(row.get("Approved Credit Period"))
-            if pd.notna(row.get("Approved Credit Period"))
-            and str(row.get("Approved Credit Period")).isdigit()
-            else None
-        ),
-        "user_phone": str(row.get("Phone") or "").strip() or None,
-    }
-
-    if record["vendor_code"] or record["vendor_name"]:
-        vendor_records.append(record)
+# Source CSV column -> VendorMaster field (string fields)
+RENAME_MAP = {
+    "Vendor Code": "vendor_code",
+    "Supplier Name": "vendor_name",
+    "Email": "email",
+    "GST": "gst_id",
+    "PAN": "company_pan",
+    "Account Number": "bank_acc_no",
+    "Beneficiary": "beneficiary_name",
+    "IFSC": "ifsc_code",
+    "Phone": "user_phone",
+}
+
+# Build each output column in one vectorized pass instead of iterating rows
+out = pd.DataFrame(index=clean_df.index)
+for source_col, target_col in RENAME_MAP.items():
+    if source_col in clean_df.columns:
+        out[target_col] = clean_df[source_col].astype("string").str.strip().replace("", pd.NA)
+    else:
+        out[target_col] = pd.Series(pd.NA, index=clean_df.index, dtype="string")
+
+# Payment terms: whole, non-negative numbers only
+if "Approved Credit Period" in clean_df.columns:
+    # Arrow-backed numbers do not support %, so check on the masked Float64 array
+    credit_period = pd.to_numeric(clean_df["Approved Credit Period"], errors="coerce").astype("Float64")
+    out["payment_term_days"] = credit_period.where((credit_period >= 0) & (credit_period % 1 == 0)).astype("Int64")
+else:
+    out["payment_term_days"] = pd.Series(pd.NA, index=clean_df.index, dtype="Int64")
+
+# Drop rows with neither a code nor a name before materializing any dicts
+out = out[out["vendor_code"].notna() | out["vendor_name"].notna()]
+
+# Keep the VendorMaster field order; plain Python objects with None for missing values
+out = out[[
+    "vendor_code", "vendor_name", "email", "gst_id", "company_pan", "bank_acc_no",
+    "beneficiary_name", "ifsc_code", "payment_term_days", "user_phone",
+]]
+out = out.astype(object).where(out.notna(), None)
+
+vendor_records = out.to_dict(orient="records")
 
 # -------------------------------------------------
 # Step 6: Save Output JSON
@@ -168,8 +177,9 @@ final_json = {"data": vendor_records}
 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 output_filename = f"vendor_master_output_{timestamp}.json"
 
-with open(output_filename, "w", encoding="utf-8") as f:
-    json.dump(final_json, f, indent=2, ensure_ascii=False)
+# orjson emits UTF-8 bytes directly (same as ensure_ascii=False)
+with open(output_filename, "wb") as f:
+    f.write(orjson.dumps(final_json, option=orjson.OPT_INDENT_2))
 
 print(f"\n✅ JSON file saved: {output_filename}")
 print(f"✅ Total vendor records: {len(vendor_records)}")
@@ -178,27 +188,47 @@ print(f"✅ Total vendor records: {len(vendor_records)}")
 # -------------------------------------------------
 print("\n📦 Moving processed CSVs to processed folder in S3...")
 
-moved_count = 0
-
-for source_key in csv_keys:
+def copy_to_processed(source_key):
+    """Copy one CSV into the processed folder; returns the source key on success"""
+    filename = source_key.split('/')[-1]
     try:
-        filename = source_key.split('/')[-1]
-        destination_key = f"{PROCESSED_PREFIX}{filename}"
-
-        # Copy file to processed folder
         s3.copy_object(
             CopySource={'Bucket': BUCKET_NAME, 'Key': source_key},
             Bucket=BUCKET_NAME,
-            Key=destination_key
+            Key=f"{PROCESSED_PREFIX}{filename}"
         )
+        return source_key
+    except Exception as e:
+        print(f"❌ Failed to move {filename}: {str(e)}")
+        return None
+
 
-        # Delete file from source folder
-        s3.delete_object(Bucket=BUCKET_NAME, Key=source_key)
-        moved_count += 1
-        print(f"✅ Moved: {filename}")
+# Copies run in parallel; only successfully copied files are deleted from the source folder
+with ThreadPoolExecutor(max_workers=32) as executor:
+    copied_keys = [key for key in executor.map(copy_to_processed, csv_keys) if key is not None]
 
+moved_count = 0
+
+# delete_objects accepts up to 1000 keys per call
+for i in range(0, len(copied_keys), 1000):
+    batch = copied_keys[i:i + 1000]
+    try:
+        response = s3.delete_objects(
+            Bucket=BUCKET_NAME,
+            Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True}
+        )
     except Exception as e:
-        print(f"❌ Failed to move {filename}: {str(e)}")
+        print(f"❌ Failed to delete batch of {len(batch)} source files: {str(e)}")
+        continue
+
+    failed_keys = {err['Key'] for err in response.get('Errors', [])}
+    for err in response.get('Errors', []):
+        print(f"❌ Failed to move {err['Key'].split('/')[-1]}: {err.get('Message')}")
+
+    for key in batch:
+        if key not in failed_keys:
+            moved_count += 1
+            print(f"✅ Moved: {key.split('/')[-1]}")
 
 print(f"\n{'='*60}")
 print(f"✅ Successfully moved {moved_count}/{len(csv_keys)} files")
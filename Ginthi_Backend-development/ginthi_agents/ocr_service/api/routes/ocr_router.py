@@ -1,5 +1,6 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from pydantic import BaseModel
+import asyncio
 import logging
 import numpy as np
 import cv2
@@ -23,7 +24,7 @@ class DocumentRequest(BaseModel):
     summary="Process Document with OCR",
     description="Process a document (image or PDF) from URL using advanced OCR technology to extract text content."
 )
-def process_document(request: DocumentRequest):  
+async def process_document(request: DocumentRequest):  
     """
     Process a document (image or PDF) from URL using advanced OCR
     
@@ -33,7 +34,7 @@ def process_document(request: DocumentRequest):
     try:
         logger.info(f"Processing document from URL: {request.url}")
         
-        result = ocr_service.OCRService.process_document_from_url(request.url)
+        result = await ocr_service.process_document_from_url(request.url)
         
         # Check if there's an error in the result
         if result.get("error"):
@@ -68,24 +69,31 @@ def process_document(request: DocumentRequest):
     summary="Verify if document is handwritten",
     description="Verify whether the given document (PDF or Image) is handwritten or printed."
 )
-def verify_handwritten(
+async def verify_handwritten(
+    request: Request,
     url: str = Query(..., description="Public URL of the image or PDF")
 ):
     """
     Verify whether the given document (PDF or Image) is handwritten or printed.
     The service:
       - Detects file type (PDF or Image)
-      - For PDF → uses PyPDF or fitz-based OCR
+      - For PDF → uses the MuPDF text layer or fitz-based OCR
       - For Image → uses pytesseract OCR
       - Computes confidence and determines if handwritten
+    The download is awaited on the shared HTTP client; OCR uses the bounded executor from lifespan.
     """
     try:
         logger.info(f"🔍 Verifying handwritten document from URL: {url}")
-        file_content = ocr_service_v2.OCRService.download_file_from_url(url)
+        file_content = await ocr_service_v2.OCRService.download_file_from_url(url)
+
+        loop = asyncio.get_running_loop()
+        ocr_executor = request.app.state.ocr_executor
 
         # --- Case 1: PDF ---
         if ocr_service_v2.OCRService.is_pdf_url(url):
-            text, confidence, pdf_type = ocr_service_v2.OCRService.extract_text_from_pdf(file_content)
+            text, confidence, pdf_type = await loop.run_in_executor(
+                ocr_executor, ocr_service_v2.OCRService.extract_text_from_pdf, file_content
+            )
 
             # Determine handwriting based on confidence or missing text
             is_handwritten = pdf_type in ["handwritten_pdf"] or confidence < 40
@@ -95,7 +103,7 @@ def verify_handwritten(
                 "file_type": pdf_type,
                 "is_handwritten": bool(is_handwritten),
                 "confidence": round(confidence, 2),
-                "method": "PyPDF" if pdf_type == "text_pdf" else "fitz + Tesseract OCR",
+                "method": "MuPDF" if pdf_type == "text_pdf" else "fitz + Tesseract OCR",
                 "summary": (
                     "Detected handwritten PDF (low OCR confidence)"
                     if is_handwritten
@@ -109,13 +117,10 @@ def verify_handwritten(
             )
 
         # --- Case 2: Image ---
-        np_arr = np.frombuffer(file_content, np.uint8)
-        image = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
-        if image is None:
-            raise ValueError("Could not decode image from URL content")
-
-        # Detect using pytesseract OCR
-        text, confidence, img_type = ocr_service_v2.OCRService.extract_text_from_image(image)
+        # Decode + pytesseract OCR in one executor hop
+        text, confidence, img_type = await loop.run_in_executor(
+            ocr_executor, _decode_and_extract_image, file_content
+        )
         is_handwritten = img_type == "handwritten_image" or confidence < 40
 
         response = {
@@ -142,13 +147,25 @@ def verify_handwritten(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _decode_and_extract_image(file_content: bytes):
+    """Decode image bytes and run OCR confidence/classification (CPU-bound, runs in executor)."""
+    # OCR only needs one channel - decoding straight to grayscale skips the colour conversion
+    np_arr = np.frombuffer(file_content, np.uint8)
+    image = cv2.imdecode(np_arr, cv2.IMREAD_GRAYSCALE)
+    if image is None:
+        raise ValueError("Could not decode image from URL content")
+
+    return ocr_service_v2.OCRService.extract_text_from_image(image)
+
+
 @router.get(
     "/extract-data",
     response_model=APIResponse,
     summary="Extract text from document",
     description="Extract text and confidence dynamically from a public URL."
 )
-def extract_data(
+async def extract_data(
+    request: Request,
     url: str = Query(..., description="Public URL of the image or PDF file"),
 ):
     """
@@ -159,7 +176,7 @@ def extract_data(
         logger.info(f"📄 Extracting data from document at URL: {url}")
 
         # Process the document using the OCR service
-        result = ocr_service_v2.OCRService.process_from_url(url)
+        result = await ocr_service_v2.OCRService.process_from_url(url, request.app.state.ocr_executor)
 
         # Check if there's an error in the result
         if "error" in result:
@@ -0,0 +1,43 @@
+import httpx
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# One pooled client per process: keeps TCP/TLS connections alive across document downloads
+_client: Optional[httpx.AsyncClient] = None
+
+
+def init_http_client() -> httpx.AsyncClient:
+    """Create the shared async HTTP client (called from the app lifespan)"""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=30,
+            http2=True,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=64),
+        )
+        logger.info("HTTP client initialized")
+    return _client
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it if the lifespan has not run"""
+    return _client if _client is not None else init_http_client()
+
+
+async def close_http_client() -> None:
+    """Close the shared client and its pooled connections"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        logger.info("HTTP client closed")
+
+
+async def fetch_bytes(url: str, headers: Optional[Dict[str, str]] = None) -> bytes:
+    """GET a URL with the shared client and return the body"""
+    response = await get_http_client().get(url, headers=headers)
+    response.raise_for_status()
+    return response.content
@@ -1,46 +1,80 @@
 import cv2
 import numpy as np
-import requests
-import io
-from PIL import Image, ImageEnhance, ImageFilter
+from PIL import Image
 import base64
 import logging
-from typing import Dict, Any
-import tempfile
-import os
+import threading
+from typing import Dict, Any, Tuple, Union
 import fitz  # PyMuPDF for PDF processing
+from ocr_service.core.http_client import fetch_bytes
 
 logger = logging.getLogger(__name__)
 
+# Preprocessing parameters (adaptive threshold: block size, constant C)
+ADVANCED_THRESH_BLOCK, ADVANCED_THRESH_C = 11, 2
+BASIC_THRESH_BLOCK, BASIC_THRESH_C = 31, 2
 
-def download_image_from_url(url: str) -> np.ndarray:
+# PIL's ImageFilter.SMOOTH kernel - the "degenerate" image ImageEnhance.Sharpness blends against
+_PIL_SMOOTH_KERNEL = np.array([[1, 1, 1], [1, 5, 1], [1, 1, 1]], dtype=np.float32) / 13
+
+# CLAHE keeps internal buffers, so the instance is built once per worker thread and reused
+_thread_state = threading.local()
+
+
+def _get_clahe() -> "cv2.CLAHE":
+    """Per-thread cached CLAHE (clipLimit=2.0, 8x8 tiles)"""
+    clahe = getattr(_thread_state, "clahe", None)
+    if clahe is None:
+        clahe = _thread_state.clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+    return clahe
+
+# Keep MuPDF's global resource store from growing with page count on long scanned PDFs.
+# PyMuPDF only exposes the store limit read-only, so it is bounded by emptying it after
+# every rendered page (release_pdf_page_cache) instead.
+fitz.TOOLS.mupdf_display_errors(False)
+
+# MuPDF shares one global context/store across documents and is not thread-safe, so every
+# fitz open/render/close/store_shrink in this process (v1 and v2 services) runs under this lock
+mupdf_lock = threading.Lock()
+
+
+def release_pdf_page_cache() -> None:
+    """Drop cached MuPDF resources after a page has been rendered (caller holds mupdf_lock)"""
+    fitz.TOOLS.store_shrink(100)
+
+
+_DOWNLOAD_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+
+async def download_bytes_from_url(url: str) -> bytes:
+    """Download raw (still encoded) file content from URL"""
+    return await fetch_bytes(url, headers=_DOWNLOAD_HEADERS)
+
+
+def decode_image(content: bytes) -> np.ndarray:
+    """Decode encoded image bytes straight to BGR with OpenCV (no PIL decode + channel swap)"""
+    opencv_image = cv2.imdecode(np.frombuffer(content, np.uint8), cv2.IMREAD_COLOR)
+    if opencv_image is None:
+        raise ValueError("Could not decode image from URL content")
+    return opencv_image
+
+
+async def download_image_from_url(url: str) -> np.ndarray:
     """Download and convert image to OpenCV format"""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, timeout=30, headers=headers)
-        response.raise_for_status()
-        
-        # Convert to OpenCV format
-        image = Image.open(io.BytesIO(response.content))
-        opencv_image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
-        return opencv_image
+        return decode_image(await download_bytes_from_url(url))
         
     except Exception as e:
         logger.error(f"Error downloading image from {url}: {str(e)}")
         raise
 
 
-def download_pdf_from_url(url: str) -> bytes:
+async def download_pdf_from_url(url: str) -> bytes:
     """Download PDF content from URL"""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, timeout=30, headers=headers)
-        response.raise_for_status()
-        return response.content
+        return await download_bytes_from_url(url)
         
     except Exception as e:
         logger.error(f"Error downloading PDF from {url}: {str(e)}")
@@ -52,38 +86,35 @@ def preprocess_image_advanced(pil_image: Image.Image) -> Image.Image:
     try:
         logger.info("Applying advanced image preprocessing...")
         
-        # Convert to RGB if needed
-        if pil_image.mode != 'RGB':
-            pil_image = pil_image.convert('RGB')
-        
-        # Convert PIL Image to OpenCV format
-        cv_image = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+        # Single-channel working image: gray input is used as-is, RGB goes straight
+        # to gray, anything else is converted by PIL directly to 'L' (no RGB detour)
+        if pil_image.mode == 'L':
+            gray = np.asarray(pil_image)
+        elif pil_image.mode == 'RGB':
+            gray = cv2.cvtColor(np.asarray(pil_image), cv2.COLOR_RGB2GRAY)
+        else:
+            gray = np.asarray(pil_image.convert('L'))
         
         # Apply CLAHE (Contrast Limited Adaptive Histogram Equalization)
-        gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-        gray = clahe.apply(gray)
+        gray = _get_clahe().apply(gray)
         
         # Noise reduction using bilateral filter
         gray = cv2.bilateralFilter(gray, 9, 75, 75)
         
-        # Morphological operations to clean up the image
-        kernel = np.ones((1,1), np.uint8)
-        gray = cv2.morphologyEx(gray, cv2.MORPH_CLOSE, kernel)
-        gray = cv2.morphologyEx(gray, cv2.MORPH_OPEN, kernel)
-        
         # Adaptive thresholding
         binary = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-                                     cv2.THRESH_BINARY, 11, 2)
+                                     cv2.THRESH_BINARY, ADVANCED_THRESH_BLOCK, ADVANCED_THRESH_C)
+        
+        # 3x3 median on the ndarray (same as PIL's MedianFilter()) - saves a PIL round-trip
+        binary = cv2.medianBlur(binary, 3)
+        
+        # Sharpness x2 as PIL's ImageEnhance does it (2*img - SMOOTH(img)), kept in OpenCV
+        smooth = cv2.filter2D(binary, -1, _PIL_SMOOTH_KERNEL)
+        binary = cv2.addWeighted(binary, 2.0, smooth, -1.0, 0)
         
         # Convert back to PIL Image
         processed_image = Image.fromarray(binary)
         
-        # Additional PIL enhancements
-        processed_image = processed_image.filter(ImageFilter.MedianFilter())
-        enhancer = ImageEnhance.Sharpness(processed_image)
-        processed_image = enhancer.enhance(2.0)
-        
         logger.info("Advanced preprocessing completed")
         return processed_image
         
@@ -92,42 +123,61 @@ def preprocess_image_advanced(pil_image: Image.Image) -> Image.Image:
         return pil_image
 
 
-def image_to_base64(pil_image: Image.Image) -> str:
-    """Convert PIL Image to base64 string"""
+def image_to_base64(image: Union[bytes, np.ndarray]) -> str:
+    """
+    Base64-encode an image for the API response.
+    - bytes: already-encoded file content, passed through as-is (no re-encode)
+    - ndarray (BGR or gray): colour images as JPEG q85, single-channel/binary as PNG
+    """
     try:
-        buffer = io.BytesIO()
-        pil_image.save(buffer, format='PNG')
-        img_bytes = buffer.getvalue()
-        return base64.b64encode(img_bytes).decode('utf-8')
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            return base64.b64encode(image).decode('utf-8')
+        
+        if image.ndim == 3:
+            ok, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 85])
+        else:
+            ok, buffer = cv2.imencode('.png', image)
+        if not ok:
+            raise ValueError("OpenCV could not encode the image")
+        return base64.b64encode(buffer.tobytes()).decode('utf-8')
         
     except Exception as e:
         logger.error(f"Error converting image to base64: {str(e)}")
         return ""
 
 
+def pixmap_to_pil(pix) -> Image.Image:
+    """Wrap a PyMuPDF pixmap's raw samples as a PIL Image (copies once, no PNG round-trip)"""
+    mode = {1: 'L', 3: 'RGB', 4: 'RGBA'}[pix.n]
+    return Image.frombytes(mode, (pix.width, pix.height), pix.samples, 'raw', mode, pix.stride)
+
+
 def process_pdf_pages(pdf_content: bytes) -> list:
     """Process PDF pages and convert to PIL Images"""
     try:
         pages_data = []
         
-        # Process PDF pages
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_file:
-            tmp_file.write(pdf_content)
-            tmp_file_path = tmp_file.name
+        # Open straight from the downloaded bytes - no temp file write/read.
+        # Every MuPDF call holds mupdf_lock, so concurrent requests render one page at a time
+        with mupdf_lock:
+            doc = fitz.open(stream=pdf_content, filetype="pdf")
         
         try:
-            doc = fitz.open(tmp_file_path)
-            
             for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                
-                # Convert page to high-resolution image
-                mat = fitz.Matrix(2.0, 2.0)  # 2x resolution
-                pix = page.get_pixmap(matrix=mat)
-                img_data = pix.tobytes("png")
-                
-                # Convert to PIL Image
-                pil_image = Image.open(io.BytesIO(img_data))
+                with mupdf_lock:
+                    page = doc.load_page(page_num)
+                    
+                    # Convert page to high-resolution image
+                    mat = fitz.Matrix(2.0, 2.0)  # 2x resolution
+                    pix = page.get_pixmap(matrix=mat, alpha=False)
+                    
+                    # Convert to PIL Image straight from the raw samples (no PNG encode/decode)
+                    pil_image = pixmap_to_pil(pix)
+                    
+                    # Release the pixmap and MuPDF's cached page resources before the next page
+                    del pix
+                    page = None
+                    release_pdf_page_cache()
                 
                 pages_data.append({
                     'page_number': page_num + 1,
@@ -137,30 +187,43 @@ def process_pdf_pages(pdf_content: bytes) -> list:
             return pages_data
             
         finally:
-            try:
+            with mupdf_lock:
                 doc.close()
-            except:
-                pass
-            try:
-                os.unlink(tmp_file_path)
-            except:
-                pass
                 
     except Exception as e:
         logger.error(f"Error processing PDF pages: {str(e)}")
         raise
 
+def to_grayscale(img: np.ndarray) -> np.ndarray:
+    """Return a single-channel view of the image (no-op if it is already grayscale)"""
+    if img.ndim == 2:
+        return img
+    return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+
+def render_pdf_page_gray(page, zoom: float = 2.0) -> np.ndarray:
+    """Render a PyMuPDF page straight to a grayscale array (caller holds mupdf_lock)"""
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY, alpha=False)
+    gray = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.stride)[:, :pix.width]
+    pix = None
+    release_pdf_page_cache()
+    return gray
+
+
 def preprocess_image(img: np.ndarray) -> np.ndarray:
     """
-    Preprocess the image for OCR:
+    Preprocess the image for OCR (accepts BGR or grayscale input):
     1. Convert to grayscale
     2. Denoise using Gaussian Blur
     3. Apply adaptive thresholding for text clarity
+    Runs through OpenCV's transparent API (UMat): with OpenCL available the
+    intermediates stay on the device, otherwise it falls back to the CPU path.
     """
     if img is None:
         raise ValueError("Input image is None")
 
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    src = cv2.UMat(img)
+    gray = src if img.ndim == 2 else cv2.cvtColor(src, cv2.COLOR_BGR2GRAY)
     gray = cv2.GaussianBlur(gray, (5, 5), 0)
 
     # Adaptive thresholding for binarization
@@ -168,31 +231,55 @@ def preprocess_image(img: np.ndarray) -> np.ndarray:
         gray, 255,
         cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
         cv2.THRESH_BINARY,
-        31, 2
+        BASIC_THRESH_BLOCK, BASIC_THRESH_C
     )
-    return thresh
+    # Download to host memory only once, at the end
+    return thresh.get()
 
 
-def detect_handwriting_texture(image: np.ndarray) -> bool:
+# Long-edge size the handwriting heuristics work at; they only need coarse statistics
+ANALYSIS_MAX_SIDE = 1024
+
+
+def edge_map(image: np.ndarray, max_side: int = ANALYSIS_MAX_SIDE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Grayscale view + Canny edge map shared by the handwriting heuristics,
+    so the conversion and edge detection run once per image.
+    Large renders are area-downscaled to max_side first; OCR keeps the full-resolution image.
+    """
+    if image is None:
+        raise ValueError("Input image is None")
+
+    gray = to_grayscale(image)
+    scale = max_side / max(gray.shape[:2])
+    if scale < 1:
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    return gray, cv2.Canny(gray, 50, 150)
+
+
+def detect_handwriting_texture(gray: np.ndarray, edges: np.ndarray) -> bool:
     """
     Detect handwritten text based on texture and edge density.
     Handwritten text tends to have:
     - Irregular edges
     - High local texture variance
+    Takes the grayscale image and its Canny edges (see edge_map).
     """
-    if image is None:
+    if gray is None or edges is None:
         raise ValueError("Input image is None")
 
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    edges = cv2.Canny(gray, 50, 150)
-
-    edge_density = np.sum(edges > 0) / (edges.shape[0] * edges.shape[1])
-    lap_var = cv2.Laplacian(gray, cv2.CV_64F).var()
+    edge_density = np.count_nonzero(edges) / (edges.shape[0] * edges.shape[1])
 
     edge_threshold = 0.08
     texture_threshold = 250
 
-    is_handwritten = edge_density > edge_threshold or lap_var > texture_threshold
+    # The Laplacian variance is only needed when the edge density alone is inconclusive
+    if edge_density > edge_threshold:
+        print(f"[Texture Detection] edge_density={edge_density:.4f}, handwritten=True")
+        return True
+
+    lap_var = cv2.Laplacian(gray, cv2.CV_64F).var()
+    is_handwritten = lap_var > texture_threshold
 
     print(f"[Texture Detection] edge_density={edge_density:.4f}, lap_var={lap_var:.2f}, handwritten={is_handwritten}")
-    return is_handwritten
\ No newline at end of file
+    return is_handwritten
@@ -2,6 +2,7 @@ import threading
 import time
 import logging
 from typing import Dict, List, Any, Tuple, Optional
+import numpy as np
 import pytesseract
 import os
 
@@ -61,6 +62,18 @@ def calculate_average_confidence(structured_data: List[Dict]) -> float:
     return round(total_confidence / len(structured_data), 2)
 
 
+def mean_word_confidence(confs: List[Any]) -> float:
+    """
+    Mean of the positive word confidences from pytesseract image_to_data
+    (-1 marks non-word boxes) or tesserocr AllWordConfidences.
+    Returns 0.0 when there are none.
+    """
+    # pytesseract returns ints, floats or numeric strings depending on version
+    values = np.asarray(confs, dtype=np.float64)
+    positive = values[values > 0]
+    return float(positive.mean()) if positive.size else 0.0
+
+
 def create_error_response(error_message: str) -> Dict[str, Any]:
     """Create standardized error response"""
     return {
@@ -74,19 +87,23 @@ def create_error_response(error_message: str) -> Dict[str, Any]:
     }
 
 
+# Tesseract config strings, built once
+OCR_CONFIGS: Dict[str, str] = {
+    'default': '--oem 3 --psm 6',
+    'single_line': '--oem 3 --psm 7',
+    'sparse_text': '--oem 3 --psm 11',
+    'table': '--oem 3 --psm 6',
+    'vertical_text': '--oem 3 --psm 5',
+    'single_block': '--oem 3 --psm 6',
+    'uniform_text': '--oem 3 --psm 4',
+    'single_text_line': '--oem 3 --psm 7',
+    'single_word': '--oem 3 --psm 8',
+    'circle_word': '--oem 3 --psm 9',
+    'single_char': '--oem 3 --psm 10',
+    'sparse_text_osd': '--oem 3 --psm 12'
+}
+
+
 def get_ocr_configs() -> Dict[str, str]:
     """Get OCR configuration options"""
-    return {
-        'default': '--oem 3 --psm 6',
-        'single_line': '--oem 3 --psm 7',
-        'sparse_text': '--oem 3 --psm 11',
-        'table': '--oem 3 --psm 6',
-        'vertical_text': '--oem 3 --psm 5',
-        'single_block': '--oem 3 --psm 6',
-        'uniform_text': '--oem 3 --psm 4',
-        'single_text_line': '--oem 3 --psm 7',
-        'single_word': '--oem 3 --psm 8',
-        'circle_word': '--oem 3 --psm 9',
-        'single_char': '--oem 3 --psm 10',
-        'sparse_text_osd': '--oem 3 --psm 12'
-    }
\ No newline at end of file
+    return OCR_CONFIGS
\ No newline at end of file
@@ -0,0 +1,79 @@
+import glob
+import logging
+import os
+import threading
+import numpy as np
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from tesserocr import PyTessBaseAPI, PSM, OEM
+
+logger = logging.getLogger(__name__)
+
+# PyTessBaseAPI is not thread-safe, so each worker thread (or pool process) keeps its own
+# instance loaded instead of forking the tesseract CLI and re-reading the model per call
+_thread_state = threading.local()
+
+
+@lru_cache(maxsize=1)
+def tessdata_path() -> Optional[str]:
+    """
+    Locate the tessdata directory for tesserocr.
+    TESSDATA_PREFIX wins; otherwise it is derived from the TESSERACT_CMD install used by
+    pytesseract (e.g. C:\\Program Files\\Tesseract-OCR\\tessdata, /opt/homebrew/share/tessdata).
+    None leaves tesserocr on libtesseract's compiled-in default.
+    """
+    prefix = os.getenv("TESSDATA_PREFIX")
+    if prefix:
+        return os.path.join(prefix, "")
+
+    tesseract_cmd = os.getenv("TESSERACT_CMD")
+    if not tesseract_cmd:
+        return None
+
+    install_dir = os.path.dirname(os.path.abspath(tesseract_cmd))
+    share_dir = os.path.join(os.path.dirname(install_dir), "share")
+    candidates = [
+        os.path.join(install_dir, "tessdata"),
+        os.path.join(share_dir, "tessdata"),
+        *sorted(glob.glob(os.path.join(share_dir, "tesseract-ocr", "*", "tessdata")), reverse=True),
+    ]
+    for candidate in candidates:
+        if os.path.isdir(candidate):
+            return os.path.join(candidate, "")
+
+    logger.warning(f"No tessdata directory found next to TESSERACT_CMD={tesseract_cmd}, using the default")
+    return None
+
+
+def get_tess_api() -> PyTessBaseAPI:
+    """Return this thread's Tesseract instance, initializing it on first use"""
+    api = getattr(_thread_state, "api", None)
+    if api is None:
+        path = tessdata_path()
+        options = {"path": path} if path else {}
+        api = _thread_state.api = PyTessBaseAPI(lang="eng", psm=PSM.AUTO, oem=OEM.DEFAULT, **options)
+        logger.info(f"Initialized in-process Tesseract {api.Version()} for {threading.current_thread().name}")
+    return api
+
+
+def ocr_image(image: np.ndarray, psm: int = PSM.AUTO) -> Tuple[str, List[int]]:
+    """
+    Run OCR on a grayscale/binary (or RGB) ndarray in-process.
+    Returns (text, word_confidences) from a single recognition pass.
+    """
+    api = get_tess_api()
+    api.SetPageSegMode(psm)
+
+    image = np.ascontiguousarray(image)
+    height, width = image.shape[:2]
+    bytes_per_pixel = 1 if image.ndim == 2 else image.shape[2]
+    api.SetImageBytes(image.tobytes(), width, height, bytes_per_pixel, width * bytes_per_pixel)
+
+    text = api.GetUTF8Text()
+    confidences = api.AllWordConfidences()
+    return text.strip(), confidences
+
+
+def warm_up_tesseract() -> None:
+    """Initialize this thread's Tesseract instance and run one tiny recognition (startup warm-up)"""
+    ocr_image(np.full((32, 32), 255, dtype=np.uint8))
@@ -3,7 +3,7 @@ import time
 import logging
 from PIL import Image
 from typing import Dict, List, Any
-from .ocr_helpers import run_with_timeout, get_ocr_configs, calculate_average_confidence
+from .ocr_helpers import run_with_timeout, get_ocr_configs, calculate_average_confidence, mean_word_confidence
 from .data_parser import extract_key_value_pairs_advanced, extract_table_data_advanced, group_words_into_lines
 
 logger = logging.getLogger(__name__)
@@ -47,9 +47,8 @@ def extract_plain_text_advanced(processed_image: Image.Image) -> str:
                     logger.warning(f"Config {config_name} timed out after 60 seconds")
                     continue
                 # Calculate average confidence
-                confidences = [int(conf) for conf in data['conf'] if int(conf) > 0]
-                if confidences:
-                    avg_confidence = sum(confidences) / len(confidences)
+                avg_confidence = mean_word_confidence(data['conf'])
+                if avg_confidence > 0:
                     logger.info(f"    Average confidence: {avg_confidence:.2f}%")
                     
                     if avg_confidence > max_confidence:
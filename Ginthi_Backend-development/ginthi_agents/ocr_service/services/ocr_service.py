@@ -1,13 +1,16 @@
+import asyncio
 import logging
 import os
 from urllib.parse import urlparse
 from PIL import Image
 import cv2
+import numpy as np
 from typing import Dict, Any
 
 from ocr_service.core.ocr_helpers import test_tesseract, create_error_response
 from ocr_service.core.image_processor import (
-    download_image_from_url, 
+    download_bytes_from_url, 
+    decode_image, 
     download_pdf_from_url, 
     preprocess_image_advanced, 
     image_to_base64,
@@ -65,10 +68,22 @@ class OCRService:
             Dictionary with extracted data
         """
         try:
-            # Download original image
-            original_image = download_image_from_url(url)
+            # Download original image (kept encoded so the response can reuse the bytes)
+            content = await download_bytes_from_url(url)
+            return await asyncio.to_thread(self._build_image_result, url, content)
+            
+        except Exception as e:
+            logger.error(f"Error processing image from URL {url}: {str(e)}")
+            return create_error_response(f"Error processing image: {str(e)}")
+    
+    def _build_image_result(self, url: str, content: bytes) -> Dict[str, Any]:
+        """
+        Decode, preprocess + extract a downloaded image (CPU-bound, runs in a worker thread)
+        """
+        try:
+            original_image = decode_image(content)
             pil_image = Image.fromarray(cv2.cvtColor(original_image, cv2.COLOR_BGR2RGB))
-            original_image_b64 = image_to_base64(pil_image)
+            original_image_b64 = image_to_base64(content)
             processed_image = preprocess_image_advanced(pil_image)
             extraction_result = extract_all_data_advanced(pil_image, processed_image)
             
@@ -107,8 +122,18 @@ class OCRService:
         """
         try:
             # Download PDF
-            pdf_content = download_pdf_from_url(url)
-            
+            pdf_content = await download_pdf_from_url(url)
+            return await asyncio.to_thread(self._build_pdf_result, url, pdf_content)
+                
+        except Exception as e:
+            logger.error(f"Error processing PDF from URL {url}: {str(e)}")
+            return create_error_response(f"Error processing PDF: {str(e)}")
+    
+    def _build_pdf_result(self, url: str, pdf_content: bytes) -> Dict[str, Any]:
+        """
+        Render + extract every page of a downloaded PDF (CPU-bound, runs in a worker thread)
+        """
+        try:
             # Process PDF pages
             pages_data_raw = process_pdf_pages(pdf_content)
             
@@ -125,7 +150,7 @@ class OCRService:
                 pil_image = page_data['pil_image']
                 
                 # Convert current page to base64
-                page_image_b64 = image_to_base64(pil_image)
+                page_image_b64 = image_to_base64(cv2.cvtColor(np.asarray(pil_image), cv2.COLOR_RGB2BGR))
                 
                 # Store first page image for backward compatibility
                 if page_num == 1:
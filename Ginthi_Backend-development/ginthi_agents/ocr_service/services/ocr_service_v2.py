@@ -1,31 +1,119 @@
-import io
-import base64
-import pytesseract
-import requests
+import os
+import multiprocessing
+import asyncio
 import numpy as np
 import cv2
-from PIL import Image
-from pypdf import PdfReader
 import fitz  # PyMuPDF
 import logging
-from typing import Dict, Any, Tuple
-from ocr_service.core.image_processor import preprocess_image, detect_handwriting_texture
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+from ocr_service.core.image_processor import (
+    preprocess_image,
+    detect_handwriting_texture,
+    edge_map,
+    image_to_base64 as encode_image_base64,
+    to_grayscale,
+    render_pdf_page_gray,
+    mupdf_lock,
+)
+from ocr_service.core.ocr_helpers import mean_word_confidence
+from ocr_service.core.tesseract_api import ocr_image, warm_up_tesseract, PSM
+from ocr_service.core.http_client import fetch_bytes
 
 logger = logging.getLogger(__name__)
 
+# Scanned-PDF page OCR is spread over a worker pool; each task handles a batch of pages
+PDF_OCR_WORKERS = int(os.getenv("PDF_OCR_WORKERS", os.cpu_count() or 1))
+PDF_OCR_PAGE_BATCH = int(os.getenv("PDF_OCR_PAGE_BATCH", 10))
+
+# "process" (default) or "thread": tesserocr and OpenCV release the GIL, so a small thread pool
+# also overlaps page rendering with recognition where spawning processes is undesirable
+PDF_OCR_EXECUTOR = os.getenv("PDF_OCR_EXECUTOR", "process").lower()
+PDF_OCR_THREADS = int(os.getenv("PDF_OCR_THREADS", 4))
+
+_page_pool: Optional[Executor] = None
+
+
+def _page_pool_workers() -> int:
+    """Number of workers in the configured page-OCR pool"""
+    return PDF_OCR_THREADS if PDF_OCR_EXECUTOR == "thread" else PDF_OCR_WORKERS
+
+
+def _get_page_pool() -> Executor:
+    """Return the shared page-OCR pool, creating it if the lifespan has not (processes are spawned, not forked)."""
+    global _page_pool
+    if _page_pool is None:
+        if PDF_OCR_EXECUTOR == "thread":
+            _page_pool = ThreadPoolExecutor(max_workers=PDF_OCR_THREADS, thread_name_prefix="pdf-ocr")
+        else:
+            _page_pool = ProcessPoolExecutor(
+                max_workers=PDF_OCR_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+    return _page_pool
+
+
+def warm_up_page_pool() -> None:
+    """Create the page-OCR pool and load Tesseract in each worker (called from the app lifespan)."""
+    pool = _get_page_pool()
+    futures = [pool.submit(warm_up_tesseract) for _ in range(_page_pool_workers())]
+    for future in futures:
+        future.result()
+
+
+def shutdown_page_pool() -> None:
+    """Stop the page-OCR pool (called from the app lifespan)."""
+    global _page_pool
+    if _page_pool is not None:
+        _page_pool.shutdown(wait=True)
+        _page_pool = None
+
+
+def _ocr_pdf_pages(
+    pdf_bytes: bytes, page_nums: List[int], keep_image_page: int = 0
+) -> List[Tuple[int, str, Optional[float], Optional[np.ndarray]]]:
+    """
+    OCR a batch of PDF pages (runs in a pool worker).
+    The document is reopened from the bytes once per batch and only rendered under the
+    MuPDF lock; the render of keep_image_page is returned as well so the caller can
+    reuse it for handwriting analysis.
+    Returns [(page_num, page_text, mean_conf or None, page_image or None)].
+    """
+    results = []
+    with mupdf_lock:
+        doc = fitz.open("pdf", pdf_bytes)
+    try:
+        for page_num in page_nums:
+            with mupdf_lock:
+                np_img = render_pdf_page_gray(doc.load_page(page_num))
+            processed = preprocess_image(np_img)
+
+            # One in-process Tesseract run gives both the text and the word confidences
+            page_text, word_confs = ocr_image(processed)
+
+            page_conf = mean_word_confidence(word_confs)
+            results.append((
+                page_num,
+                page_text,
+                page_conf if page_conf > 0 else None,
+                np_img if page_num == keep_image_page else None,
+            ))
+    finally:
+        with mupdf_lock:
+            doc.close()
+    return results
+
 
 class OCRService:
     # ----------------------------
     # Utility
     # ----------------------------
     @staticmethod
-    def download_file_from_url(url: str) -> bytes:
+    async def download_file_from_url(url: str) -> bytes:
         """Download file (image or PDF) from URL."""
         try:
             headers = {"User-Agent": "Mozilla/5.0"}
-            response = requests.get(url, timeout=30, headers=headers)
-            response.raise_for_status()
-            return response.content
+            return await fetch_bytes(url, headers=headers)
         except Exception as e:
             logger.error(f"Error downloading file from {url}: {e}")
             raise
@@ -36,36 +124,38 @@ class OCRService:
 
     @staticmethod
     def image_to_base64(image: np.ndarray) -> str:
-        """Convert numpy image to Base64 string."""
-        _, buffer = cv2.imencode(".png", image)
-        return base64.b64encode(buffer).decode("utf-8")
+        """Convert numpy image to Base64 string (JPEG for colour, PNG for gray/binary)."""
+        return encode_image_base64(image)
 
     # ----------------------------
     # Advanced Handwriting Features
     # ----------------------------
     @staticmethod
-    def analyze_contour_irregularity(image: np.ndarray) -> float:
+    def analyze_contour_irregularity(edges: np.ndarray) -> float:
         """
         Measure irregularity of contours — handwritten text
         often has more jagged, inconsistent contours.
+        Takes the Canny edge map from edge_map().
         Returns irregularity score (0–1 range).
         """
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        edges = cv2.Canny(gray, 50, 150)
         contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
 
         if not contours:
             return 0.0
 
-        irregularities = []
-        for c in contours:
-            perimeter = cv2.arcLength(c, True)
-            area = cv2.contourArea(c)
-            if area > 10:  # ignore noise
-                circularity = (4 * np.pi * area) / (perimeter ** 2 + 1e-6)
-                irregularities.append(abs(1 - circularity))
+        # Per-contour measurements into flat arrays, then one vectorized circularity pass
+        count = len(contours)
+        areas = np.fromiter((cv2.contourArea(c) for c in contours), dtype=np.float64, count=count)
+        mask = areas > 10  # ignore noise
+        if not mask.any():
+            return 0.0
 
-        return float(np.mean(irregularities)) if irregularities else 0.0
+        perimeters = np.fromiter(
+            (cv2.arcLength(c, True) for c, keep in zip(contours, mask) if keep),
+            dtype=np.float64, count=int(mask.sum())
+        )
+        circularity = (4 * np.pi * areas[mask]) / (perimeters ** 2 + 1e-6)
+        return float(np.abs(1 - circularity).mean())
 
     @staticmethod
     def enhanced_handwritten_ocr(image: np.ndarray) -> Tuple[str, float]:
@@ -73,20 +163,22 @@ class OCRService:
         Secondary OCR pass optimized for handwriting.
         """
         try:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            gray = to_grayscale(image)
             gray = cv2.convertScaleAbs(gray, alpha=1.8, beta=35)
-            gray = cv2.bilateralFilter(gray, 7, 50, 50)
+            # Recursive (separable) domain-transform filter instead of the O(d^2) bilateral;
+            # sigma_s ~ bilateral radius, sigma_r = 50/255. It only takes 3-channel input.
+            gray = cv2.cvtColor(
+                cv2.edgePreservingFilter(
+                    cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR),
+                    flags=cv2.RECURS_FILTER, sigma_s=7, sigma_r=0.2
+                ),
+                cv2.COLOR_BGR2GRAY
+            )
             _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
 
-            text = pytesseract.image_to_string(
-                binary,
-                lang="eng",
-                config="--psm 6 --oem 3"
-            ).strip()
-
-            data = pytesseract.image_to_data(binary, output_type=pytesseract.Output.DICT)
-            confs = [int(conf) for conf in data["conf"] if str(conf).isdigit() and int(conf) > 0]
-            avg_conf = np.mean(confs) if confs else 0.0
+            # Same thread-local Tesseract instance, switched to single-block mode (psm 6)
+            text, word_confs = ocr_image(binary, psm=PSM.SINGLE_BLOCK)
+            avg_conf = mean_word_confidence(word_confs)
 
             return text, avg_conf
 
@@ -103,51 +195,74 @@ class OCRService:
         Extract text dynamically from PDFs.
         """
         try:
-            text = ""
-            reader = PdfReader(io.BytesIO(pdf_bytes))
-            for page in reader.pages:
-                page_text = page.extract_text() or ""
-                logger.info(f"Extracted text from page: {page_text[:100]}")  # Log first 100 characters
-                text += page_text
+            # Probe embedded text with MuPDF - the same parser used for rendering, one load of the file
+            with mupdf_lock, fitz.open("pdf", pdf_bytes) as doc:
+                page_texts = [doc.load_page(page_num).get_text() for page_num in range(len(doc))]
 
-            if len(text.strip()) > 50:
-                logger.info("✅ Text-based PDF (PyPDF).")
-                return text.strip(), 95.0, "text_pdf"
+            if not page_texts:
+                raise ValueError("PDF has no pages")
 
-            # OCR for scanned PDFs
-            doc = fitz.open("pdf", pdf_bytes)
-            all_text, confidences = [], []
+            for page_text in page_texts:
+                logger.info(f"Extracted text from page: {page_text[:100]}")  # Log first 100 characters
 
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
-                pil_img = Image.open(io.BytesIO(pix.tobytes("png")))
-                np_img = cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
-                processed = preprocess_image(np_img)
+            native_chars = sum(len(page_text.strip()) for page_text in page_texts)
+            is_text_pdf = native_chars > 50
+            if is_text_pdf:
+                # Text PDF - OCR only the pages without a text layer (mixed PDFs)
+                ocr_pages = [page_num for page_num, page_text in enumerate(page_texts) if not page_text.strip()]
+                if not ocr_pages:
+                    logger.info("✅ Text-based PDF (MuPDF).")
+                    return "\n".join(page_texts).strip(), 95.0, "text_pdf"
+            else:
+                # Scanned PDF - OCR every page
+                ocr_pages = list(range(len(page_texts)))
+
+            # OCR for scanned pages
+            # Pages are rendered directly to grayscale - every downstream step works on one channel
+            # Spread short documents across all workers; cap batch size for long ones
+            ocr_count = len(ocr_pages)
+            workers = _page_pool_workers()
+            batch_size = max(1, min(PDF_OCR_PAGE_BATCH, -(-ocr_count // workers)))
+            batches = [ocr_pages[i:i + batch_size] for i in range(0, ocr_count, batch_size)]
+            batch_args = ([pdf_bytes] * len(batches), batches, [ocr_pages[0]] * len(batches))
+
+            if ocr_count > 1 and workers > 1:
+                pool = _get_page_pool()
+                batch_results = pool.map(_ocr_pdf_pages, *batch_args)
+            else:
+                batch_results = map(_ocr_pdf_pages, *batch_args)
 
-                data = pytesseract.image_to_data(processed, output_type=pytesseract.Output.DICT)
-                page_text = pytesseract.image_to_string(processed)
-                all_text.append(page_text)
+            # Text-layer pages keep their embedded text at text-PDF confidence
+            all_text = [page_text if page_text.strip() else "" for page_text in page_texts]
+            confidences = [95.0] * (len(page_texts) - ocr_count)
+            first_page_img = None
 
-                page_conf = [int(conf) for conf in data["conf"] if str(conf).isdigit() and int(conf) > 0]
-                if page_conf:
-                    confidences.append(np.mean(page_conf))
+            for batch in batch_results:
+                for page_num, page_text, page_conf, page_img in batch:
+                    all_text[page_num] = page_text
+                    if page_conf is not None:
+                        confidences.append(page_conf)
+                    if page_img is not None:
+                        first_page_img = page_img
 
             text = "\n".join(all_text).strip()
             avg_conf = np.mean(confidences) if confidences else 0.0
 
-            # Texture + contour analysis
-            page = doc.load_page(0)
-            pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
-            img = Image.open(io.BytesIO(pix.tobytes("png")))
-            np_img = cv2.cvtColor(np.array(img), cv2.COLOR_RGB2BGR)
-            texture_detected = detect_handwriting_texture(np_img)
-            contour_score = OCRService.analyze_contour_irregularity(np_img)
+            if is_text_pdf:
+                # Only pages without a text layer (covers, separators, scanned inserts) were OCR'd;
+                # the document itself is still a text PDF
+                logger.info(f"✅ Text-based PDF (MuPDF), {ocr_count} page(s) without a text layer OCR'd.")
+                return text, avg_conf, "text_pdf"
+
+            # Texture + contour analysis on the first OCR'd page render kept from the page loop
+            gray, edges = edge_map(first_page_img)
+            texture_detected = detect_handwriting_texture(gray, edges)
+            contour_score = OCRService.analyze_contour_irregularity(edges)
 
             # Enhanced OCR refinement
             if texture_detected or avg_conf < 60 or contour_score > 0.3:
                 logger.info("⚙️ Running enhanced handwritten OCR refinement...")
-                extra_text, extra_conf = OCRService.enhanced_handwritten_ocr(np_img)
+                extra_text, extra_conf = OCRService.enhanced_handwritten_ocr(first_page_img)
                 if extra_text:
                     text += "\n" + extra_text
                     avg_conf = (avg_conf + extra_conf) / 2
@@ -175,14 +290,13 @@ class OCRService:
     def extract_text_from_image(image: np.ndarray) -> Tuple[str, float, str]:
         """Extract text + confidence + classify image type."""
         processed = preprocess_image(image)
-        data = pytesseract.image_to_data(processed, output_type=pytesseract.Output.DICT)
-        text = pytesseract.image_to_string(processed).strip()
+        text, word_confs = ocr_image(processed)
 
-        confidences = [int(conf) for conf in data["conf"] if str(conf).isdigit() and int(conf) > 0]
-        avg_conf = np.mean(confidences) if confidences else 0.0
+        avg_conf = mean_word_confidence(word_confs)
 
-        texture_detected = detect_handwriting_texture(image)
-        contour_score =  OCRService.analyze_contour_irregularity(image)
+        gray, edges = edge_map(image)
+        texture_detected = detect_handwriting_texture(gray, edges)
+        contour_score = OCRService.analyze_contour_irregularity(edges)
 
         # Enhanced OCR if confidence < 60
         if avg_conf < 60 or texture_detected:
@@ -210,12 +324,26 @@ class OCRService:
     # End-to-End URL Processor
     # ----------------------------
     @staticmethod
-    def process_from_url(url: str) -> Dict[str, Any]:
-        """Full OCR pipeline: download, detect, extract, classify."""
+    async def process_from_url(url: str, executor: Optional[Executor] = None) -> Dict[str, Any]:
+        """
+        Full OCR pipeline: download, detect, extract, classify.
+        The download is awaited; OCR runs on the given executor (default loop executor).
+        """
         try:
             logger.info(f"Processing OCR for URL: {url}")
-            file_content = OCRService.download_file_from_url(url)
+            file_content = await OCRService.download_file_from_url(url)
+
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, OCRService.process_content, url, file_content)
 
+        except Exception as e:
+            logger.error(f"OCR processing error for {url}: {e}")
+            return {"error": str(e)}
+
+    @staticmethod
+    def process_content(url: str, file_content: bytes) -> Dict[str, Any]:
+        """Detect, extract and classify already-downloaded content (CPU-bound)."""
+        try:
             # PDF
             if OCRService.is_pdf_url(url):
                 text, confidence, pdf_type = OCRService.extract_text_from_pdf(file_content)
@@ -229,7 +357,7 @@ class OCRService:
 
             # Image
             np_arr = np.frombuffer(file_content, np.uint8)
-            image = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
+            image = cv2.imdecode(np_arr, cv2.IMREAD_GRAYSCALE)
             if image is None:
                 raise ValueError("Could not decode image from URL content")
 
@@ -1,5 +1,11 @@
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+import asyncio
 import logging
+import os
+from ocr_service.services.ocr_service_v2 import warm_up_page_pool, shutdown_page_pool
+from ocr_service.core.http_client import init_http_client, close_http_client
+from ocr_service.core.tesseract_api import get_tess_api, warm_up_tesseract
 
 logger = logging.getLogger(__name__)
 
@@ -12,10 +18,31 @@ async def lifespan(app):
     """
     # Startup
     logger.info("Starting OCR Service...")
+    # Bounded pool for Tesseract/OpenCV work - caps concurrent OCR runs at one per core
+    ocr_workers = int(os.getenv("OCR_WORKERS", os.cpu_count() or 1))
+    # Every worker thread loads its own Tesseract instance as it starts
+    app.state.ocr_executor = ThreadPoolExecutor(
+        max_workers=ocr_workers, thread_name_prefix="ocr", initializer=get_tess_api
+    )
+    logger.info(f"OCR executor started with {ocr_workers} workers")
+    
+    # Warm up all workers before serving so the first requests don't pay model init
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*(
+        loop.run_in_executor(app.state.ocr_executor, warm_up_tesseract) for _ in range(ocr_workers)
+    ))
+    # Spawn the page-OCR workers now so the first scanned PDF doesn't pay process start-up
+    await asyncio.to_thread(warm_up_page_pool)
+    logger.info("Tesseract warm-up complete")
+    # Pooled async client for document downloads
+    app.state.http = init_http_client()
     logger.info("OCR Service started successfully")
     
     yield
     
     # Shutdown
     logger.info("Shutting down OCR Service...")
+    app.state.ocr_executor.shutdown(wait=True)
+    shutdown_page_pool()
+    await close_http_client()
     logger.info("OCR Service shutdown complete")
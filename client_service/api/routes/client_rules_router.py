@@ -1,4 +1,5 @@
 from fastapi import APIRouter, status, Depends
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional
 
 from client_service.schemas.pydantic_schemas import (
@@ -7,12 +8,16 @@ from client_service.schemas.pydantic_schemas import (
 )
 from client_service.schemas.base_response import APIResponse
 from client_service.services.client_rules_service import ClientRulesService
+from client_service.utils.pydantic_utils import to_json_response
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Stateless service - one shared instance instead of a new one per request
+_service = ClientRulesService()
 
 # Dependency injection for the service
 def get_client_rules_service() -> ClientRulesService:
-    return ClientRulesService()
+    return _service
 
 # ─────────────────────────────
 # CREATE RULE
@@ -36,16 +41,18 @@ async def create_rule(
 # ─────────────────────────────
 @router.get(
     "/",
-    response_model=APIResponse,
+    response_model=None,
+    responses={200: {"model": APIResponse}},
     status_code=status.HTTP_200_OK,
     summary="Get all client rules",
-    description="Fetches all client rules with pagination support using `skip` and `limit` parameters."
+    description="Fetches all client rules with pagination support using `skip` and `limit` parameters, "
+    "or `after_id` (the last returned rule id) for keyset paging."
 )
-async def get_all_rules(skip: int = 0, limit: int = 100,
+async def get_all_rules(skip: int = 0, limit: int = 100, after_id: Optional[str] = None,
     service: ClientRulesService = Depends(get_client_rules_service)
 ):
     """Get all client rules"""
-    return await service.get_all_rules(skip, limit)
+    return to_json_response(await service.get_all_rules(skip, limit, after_id))
 
 # ─────────────────────────────
 # SEARCH RULES - TWO COLUMNS
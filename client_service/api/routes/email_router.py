@@ -1,10 +1,11 @@
 # client_service/api/routes/notification_router.py
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from client_service.services.email_service import NotificationService
 from client_service.schemas.pydantic_schemas import SendNotificationRequest, TemplateCreateRequest, TemplateUpdateRequest
 from client_service.schemas.base_response import APIResponse
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 service = NotificationService()
 
 # List templates
@@ -1,8 +1,11 @@
 from fastapi import APIRouter, status
+from fastapi.responses import ORJSONResponse
+from typing import Optional
 from client_service.schemas.base_response import APIResponse
 from client_service.services.transaction_log_service import TransactionLogService
+from client_service.utils.pydantic_utils import to_json_response
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 @router.get(
@@ -33,19 +36,24 @@ async def get_transaction_log(log_id: str):
 
 @router.get(
     "/transaction-logs",
-    response_model=APIResponse,
+    response_model=None,
+    responses={200: {"model": APIResponse}},
     status_code=status.HTTP_200_OK,
     operation_id="list_transaction_logs",
     summary="List all transaction logs",
     description=(
         "Lists all transaction logs with pagination. Returns array of logs with timestamp, "
-        "service name, HTTP method, path, IP address, status code, duration, headers, and request body. "
-        "Call: GET /transaction-logs?skip=0&limit=100. Default: skip=0, limit=100 (max)."
+        "service name, HTTP method, path, IP address, status code and duration; headers and request body "
+        "are included with include_payloads=true. "
+        "Call: GET /transaction-logs?skip=0&limit=100. Default: skip=0, limit=100 (max). "
+        "For deep paging pass after_id=<pagination.next_cursor> instead of skip."
     ),
 )
 async def list_transaction_logs(
     skip: int = 0,
     limit: int = 100,
+    include_payloads: bool = False,
+    after_id: Optional[str] = None,
 ):
     """
     Get all transaction logs with pagination.
@@ -53,11 +61,15 @@ async def list_transaction_logs(
     Args:
         skip: Number of records to skip (for pagination)
         limit: Maximum number of records to return (max 100)
+        include_payloads: Also return headers and request body (omitted by default)
+        after_id: Keyset cursor - pass pagination.next_cursor from the previous page
 
     Returns:
         APIResponse with list of transaction logs
     """
-    return await TransactionLogService.get_all(
+    return to_json_response(await TransactionLogService.get_all(
         skip=skip,
         limit=limit,
-    )
\ No newline at end of file
+        include_payloads=include_payloads,
+        after_id=after_id,
+    ))
\ No newline at end of file
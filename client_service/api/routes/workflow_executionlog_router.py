@@ -1,4 +1,5 @@
 from fastapi import APIRouter, status, Depends
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional
 
 from client_service.schemas.pydantic_schemas import (
@@ -6,12 +7,16 @@ from client_service.schemas.pydantic_schemas import (
 )
 from client_service.schemas.base_response import APIResponse
 from client_service.services.workflow_executionlog_service import WorkflowExecutionLogService
+from client_service.utils.pydantic_utils import to_json_response
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Stateless service - one shared instance instead of a new one per request
+_service = WorkflowExecutionLogService()
 
 # Dependency injection
 def get_workflow_executionlog_service() -> WorkflowExecutionLogService:
-    return WorkflowExecutionLogService()
+    return _service
 
 # ─────────────────────────────
 # CREATE LOG
@@ -34,15 +39,17 @@ async def create_log(
 # ─────────────────────────────
 @router.get(
     "/",
-    response_model=APIResponse,
+    response_model=None,
+    responses={200: {"model": APIResponse}},
     status_code=status.HTTP_200_OK,
     summary="Get all workflow execution logs",
-    description="Fetches all workflow execution logs with pagination support using `skip` and `limit` parameters."
+    description="Fetches all workflow execution logs with pagination support using `skip` and `limit` parameters, "
+    "or `after_id` (the last returned log id) for keyset paging."
 )
-async def get_all_logs(skip: int = 0, limit: int = 100,
+async def get_all_logs(skip: int = 0, limit: int = 100, after_id: Optional[str] = None,
     service: WorkflowExecutionLogService = Depends(get_workflow_executionlog_service)
 ):
-    return await service.get_all_logs(skip, limit)
+    return to_json_response(await service.get_all_logs(skip, limit, after_id))
 
 # ─────────────────────────────
 # SEARCH LOGS - ONE OR TWO COLUMNS (OPTIONAL)
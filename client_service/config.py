@@ -1,5 +1,7 @@
 import boto3
 import os
+from functools import lru_cache
+from botocore.config import Config
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -8,28 +10,41 @@ AWS_ACCESS_KEY = os.getenv("SES_ACCESS_KEY")
 AWS_SECRET_KEY = os.getenv("SES_SECRET_KEY")
 AWS_REGION = os.getenv("AWS_REGION", "ap-south-1")
 
-# DynamoDB resource
-dynamodb = boto3.resource(
-    "dynamodb",
-    aws_access_key_id=AWS_ACCESS_KEY,
-    aws_secret_access_key=AWS_SECRET_KEY,
-    region_name=AWS_REGION,
+# Clients are built on first use: creating one loads botocore's service model, so a worker
+# only pays for the services it actually calls. All of them share one connection/retry config.
+AWS_CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={"mode": "standard"},
 )
 
-# SES client
-ses_client = boto3.client(
-    "ses",
-    aws_access_key_id=AWS_ACCESS_KEY,
-    aws_secret_access_key=AWS_SECRET_KEY,
-    region_name=AWS_REGION,
-)
 
-sns_client = boto3.client(
-    "sns", 
-    aws_access_key_id=AWS_ACCESS_KEY,
-    aws_secret_access_key=AWS_SECRET_KEY,
-    region_name=AWS_REGION,
-)
+@lru_cache(maxsize=1)
+def _aws_session() -> boto3.session.Session:
+    return boto3.session.Session(
+        aws_access_key_id=AWS_ACCESS_KEY,
+        aws_secret_access_key=AWS_SECRET_KEY,
+        region_name=AWS_REGION,
+    )
+
+
+# DynamoDB resource
+@lru_cache(maxsize=1)
+def get_dynamodb():
+    return _aws_session().resource("dynamodb", config=AWS_CLIENT_CONFIG)
+
+
+# SES v2 client (bulk email)
+@lru_cache(maxsize=1)
+def get_sesv2_client():
+    return _aws_session().client("sesv2", config=AWS_CLIENT_CONFIG)
+
+
+@lru_cache(maxsize=1)
+def get_sns_client():
+    return _aws_session().client("sns", config=AWS_CLIENT_CONFIG)
+
+
 SES_SENDER_EMAIL = os.getenv("SES_SENDER_EMAIL")
 
 EUM_SMS_API_URL = os.getenv("EUM_SMS_API_URL")
@@ -4,6 +4,7 @@ from beanie import init_beanie
 from dotenv import load_dotenv
 from client_service.schemas.mongo_schemas.client_schema_model import ClientSchema
 from client_service.schemas.mongo_schemas.email_schemas_model import NotificationTemplateModel
+from client_service.schemas.mongo_schemas.transaction_log import TransactionLogModel
 from client_service.schemas.mongo_schemas.client_workflow_execution import (
     ClientWorkflows,
     ClientRules,
@@ -20,9 +21,16 @@ logger = logging.getLogger(__name__)
 # MongoDB configuration
 MONGO_URI = os.getenv("MONGO_URI")
 MONGO_DB = os.getenv("MONGO_DB")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "10"))
 
-# Async MongoDB client
-client = motor.motor_asyncio.AsyncIOMotorClient(MONGO_URI)
+# Async MongoDB client, shared by every Beanie model in the process; the minimum keeps warm
+# connections ready so request bursts do not pay connection setup
+client = motor.motor_asyncio.AsyncIOMotorClient(
+    MONGO_URI,
+    maxPoolSize=MONGO_MAX_POOL_SIZE,
+    minPoolSize=MONGO_MIN_POOL_SIZE,
+)
 db = client[MONGO_DB]
 
 
@@ -48,6 +56,10 @@ async def init_db():
     # Initialize Beanie
     await init_beanie(database=db, document_models=document_models)
     logger.info("Beanie initialization complete")
+
+    # Transaction logs are written by the middleware (not a Beanie model); the list endpoint
+    # pages them newest first
+    await db[TransactionLogModel.Settings.name].create_index([("timestamp", -1), ("_id", -1)])
     return db
 
 
@@ -1,13 +1,20 @@
 import os
-import requests
-import boto3
+import queue
+import asyncio
+import logging
+from logging.handlers import QueueHandler, QueueListener
+import httpx
 import pandas as pd
-from io import BytesIO
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import fs
 from datetime import datetime
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # AWS Config
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
@@ -19,31 +26,65 @@ SERVICE_NAME = os.getenv("SERVICE_NAME", "client_service_logs")
 
 # API URL
 API_URL = "http://127.0.0.1:8005/api/v1/transaction-logs"
+PAGE_SIZE = 100  # API maximum per request
+FETCH_CONCURRENCY = int(os.getenv("ETL_FETCH_CONCURRENCY", 8))  # Pages in flight at once
 
 
-def fetch_transaction_logs():
-    """Fetch logs from API and normalize into flat table."""
-    print("Fetching data from API...")
-    response = requests.get(API_URL)
+async def fetch_page(client: httpx.AsyncClient, skip: int, semaphore: asyncio.Semaphore) -> dict:
+    """Fetch one page of logs; returns the response's data block (logs + pagination)."""
+    async with semaphore:
+        response = await client.get(API_URL, params={"skip": skip, "limit": PAGE_SIZE, "include_payloads": "true"})
 
     if response.status_code != 200:
         raise Exception(f"API Error {response.status_code}: {response.text}")
 
-    raw_data = response.json().get("data", [])
+    return response.json().get("data") or {}
+
+
+async def fetch_transaction_logs():
+    """Fetch all log pages from API and flatten them into an Arrow table."""
+    logger.info("Fetching data from API...")
+    # One pooled client for every page so connections are kept alive across requests
+    async with httpx.AsyncClient(
+        timeout=60,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+    ) as client:
+        # The first page reports the total, so the remaining pages are requested concurrently,
+        # bounded so the API is not flooded
+        semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+        first_page = await fetch_page(client, 0, semaphore)
+        total = first_page.get("pagination", {}).get("total", 0)
+        pages = await asyncio.gather(
+            *(fetch_page(client, skip, semaphore) for skip in range(PAGE_SIZE, total, PAGE_SIZE))
+        )
+
+    raw_data = [log for page in (first_page, *pages) for log in page.get("logs", [])]
 
     if not raw_data:
-        print("No logs found from API.")
-        return pd.DataFrame()
+        logger.info("No logs found from API.")
+        return pa.table({})
+
+    return flatten_logs(raw_data)
+
 
-    # FIX: Normalize nested JSON → flat DataFrame
-    df = pd.json_normalize(raw_data)
+def flatten_logs(raw_data: list) -> pa.Table:
+    """Build a columnar table from the log records, expanding nested objects into dotted columns."""
+    try:
+        table = pa.Table.from_struct_array(pa.array(raw_data))
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # A field with mixed types across records (e.g. str vs object) - let pandas normalize it
+        return pa.Table.from_pandas(pd.json_normalize(raw_data), preserve_index=False)
+
+    # Same "parent.child" column names as pd.json_normalize
+    while any(pa.types.is_struct(field.type) for field in table.schema):
+        table = table.flatten()
 
-    return df
+    return table
 
 
-def upload_to_s3(df: pd.DataFrame):
-    """Convert DataFrame to Parquet and upload to S3."""
-    print("Preparing S3 upload...")
+def upload_to_s3(table: pa.Table):
+    """Write the log table as Parquet and upload to S3."""
+    logger.info("Preparing S3 upload...")
 
     today = datetime.now()
     year = today.strftime("%Y")
@@ -53,36 +94,62 @@ def upload_to_s3(df: pd.DataFrame):
 
     s3_key = f"{SERVICE_NAME}/{year}/{month}/{day}/{SERVICE_NAME}_{date_str}.parquet"
 
-    s3 = boto3.client(
-        "s3",
-        aws_access_key_id=AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-        region_name=AWS_REGION
+    s3 = fs.S3FileSystem(
+        access_key=AWS_ACCESS_KEY_ID,
+        secret_key=AWS_SECRET_ACCESS_KEY,
+        region=AWS_REGION
     )
 
-    # Convert DataFrame → Parquet
-    buffer = BytesIO()
-    df.to_parquet(buffer, index=False)
-    buffer.seek(0)
+    # Arrow → Parquet, streamed to S3 as a multipart upload (no full in-memory file)
+    with s3.open_output_stream(f"{S3_BUCKET_NAME}/{s3_key}") as out:
+        # Repetitive columns (service, method, path, headers) dictionary-encode into small codes
+        pq.write_table(
+            table,
+            out,
+            compression="zstd",
+            compression_level=3,
+            use_dictionary=True,
+            data_page_size=1 << 20,
+            row_group_size=64_000,
+        )
+
+    logger.info("Upload Successful → s3://%s/%s", S3_BUCKET_NAME, s3_key)
 
-    # Upload
-    s3.upload_fileobj(buffer, S3_BUCKET_NAME, s3_key)
 
-    print(f"Upload Successful → s3://{S3_BUCKET_NAME}/{s3_key}")
+def setup_queue_logging(level: int = logging.INFO) -> QueueListener:
+    """
+    Route log records through a queue so formatting and stdout writes happen on a listener thread.
+    Kept local so the script runs standalone (python client_service/etl_transaction_logs.py) without the package on sys.path.
+    """
+    log_queue = queue.Queue(-1)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.handlers[:] = [QueueHandler(log_queue)]
+
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
 
 
 def main():
+    log_listener = setup_queue_logging()
     try:
-        df = fetch_transaction_logs()
+        table = asyncio.run(fetch_transaction_logs())
 
-        if df.empty:
-            print("No data to upload.")
+        if table.num_rows == 0:
+            logger.info("No data to upload.")
             return
 
-        upload_to_s3(df)
+        upload_to_s3(table)
 
     except Exception as e:
-        print("Error:", str(e))
+        logger.error("Error: %s", e)
+
+    finally:
+        log_listener.stop()
 
 
 if __name__ == "__main__":
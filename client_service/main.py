@@ -156,6 +156,11 @@ def main():
         reload=os.getenv("RELOAD", "true").lower() == "true",
         log_level=os.getenv("LOG_LEVEL", "info").lower(),
         workers=int(os.getenv("WORKERS", 1)),
+        # "auto" picks uvloop and httptools when installed; uvloop is not available on Windows
+        loop="auto",
+        http="auto",
+        limit_concurrency=int(os.getenv("LIMIT_CONCURRENCY", 1024)),
+        backlog=int(os.getenv("BACKLOG", 2048)),
     )
 
 
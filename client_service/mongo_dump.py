@@ -1,13 +1,18 @@
 
 import os
+import queue
+import logging
 import subprocess
-from pathlib import Path
-from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from pymongo import MongoClient
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # ----- CONFIG -----
 MONGO_URI = os.getenv("MONGO_URI")               # Source DB
 MONGO_DB = os.getenv("MONGO_DB")
@@ -27,67 +32,110 @@ missing = [k for k, val in REQUIRED_ENV.items() if not val]
 if missing:
     raise ValueError(f"❌ Missing required environment variables: {missing}")
 
-# Timestamp folder for backup
-TIMESTAMP = datetime.now().strftime("%Y%m%d_%H%M%S")
-DUMP_DIR = Path(f"mongo_dump_{TIMESTAMP}")
+# Parallelism for the streamed copy
+DUMP_WORKERS = int(os.getenv("DUMP_WORKERS", 8))                 # Collections copied at once
+RESTORE_INSERTION_WORKERS = int(os.getenv("RESTORE_INSERTION_WORKERS", 4))
+DUMP_READ_PREFERENCE = os.getenv("DUMP_READ_PREFERENCE", "secondaryPreferred")  # Keep reads off the primary
 
 # ------------------------------------------------------------------
-# MongoDB Dump Function
+# Logging
 # ------------------------------------------------------------------
-def dump_mongo_db():
-    """Dump MongoDB database locally with timestamp-based folder."""
-    try:
-        DUMP_DIR.mkdir(parents=True, exist_ok=True)
+def setup_queue_logging(level: int = logging.INFO) -> QueueListener:
+    """
+    Route log records through a queue so formatting and stdout writes happen on a listener thread.
+    Kept local so the script runs standalone (python client_service/mongo_dump.py) without the package on sys.path.
+    """
+    log_queue = queue.Queue(-1)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
 
-        dump_cmd = [
-            "mongodump",
-            f"--uri={MONGO_URI}",
-            f"--db={MONGO_DB}",
-            f"--out={DUMP_DIR}",
-        ]
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.handlers[:] = [QueueHandler(log_queue)]
 
-        print("\n🚀 Running MongoDB Dump Command:")
-        print(" ".join(dump_cmd))
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
 
-        subprocess.run(dump_cmd, check=True)
-
-        print(f"✔ Dump completed! Saved at: {DUMP_DIR}")
 
+# ------------------------------------------------------------------
+# MongoDB Dump + Restore Pipeline
+# ------------------------------------------------------------------
+def copy_collection(collection: str):
+    """
+    Stream a gzip archive dump of one source collection straight into mongorestore
+    on the target server - no intermediate dump folder on disk.
+    """
+    dump_cmd = [
+        "mongodump",
+        f"--uri={MONGO_URI}",
+        f"--db={MONGO_DB}",
+        f"--collection={collection}",
+        f"--readPreference={DUMP_READ_PREFERENCE}",
+        "--archive",
+        "--gzip",
+    ]
+
+    restore_cmd = [
+        "mongorestore",
+        f"--uri={SERVER_URI}",
+        f"--nsFrom={MONGO_DB}.{collection}",
+        f"--nsTo={SERVER_DB_NAME}.{collection}",
+        "--archive",
+        "--gzip",
+        f"--numInsertionWorkersPerCollection={RESTORE_INSERTION_WORKERS}",
+    ]
+
+    dump_proc = subprocess.Popen(dump_cmd, stdout=subprocess.PIPE)
+    try:
+        restore_proc = subprocess.Popen(restore_cmd, stdin=dump_proc.stdout)
     except FileNotFoundError:
-        print("❌ ERROR: 'mongodump' not found. Install MongoDB Database Tools.")
-        raise
-    except subprocess.CalledProcessError as e:
-        print("❌ Dump failed:", e)
+        dump_proc.kill()
+        dump_proc.wait()
         raise
 
+    # Let mongodump see SIGPIPE if mongorestore exits early
+    dump_proc.stdout.close()
 
-# ------------------------------------------------------------------
-# MongoDB Restore Function
-# ------------------------------------------------------------------
-def restore_to_server():
-    """Restore local dump folder to target MongoDB server."""
-    try:
-        restore_path = DUMP_DIR / MONGO_DB
+    restore_code = restore_proc.wait()
+    dump_code = dump_proc.wait()
+
+    if dump_code != 0:
+        raise subprocess.CalledProcessError(dump_code, dump_cmd)
+    if restore_code != 0:
+        raise subprocess.CalledProcessError(restore_code, restore_cmd)
 
-        restore_cmd = [
-            "mongorestore",
-            f"--uri={SERVER_URI}",
-            f"--db={SERVER_DB_NAME}",
-            str(restore_path),
-        ]
+    logger.info("✔ %s copied", collection)
+
+
+def dump_mongo_db():
+    """
+    Copy every collection of the source DB to the target server, running one
+    mongodump | mongorestore pipeline per collection in parallel.
+    """
+    try:
+        client = MongoClient(MONGO_URI)
+        try:
+            collections = client[MONGO_DB].list_collection_names()
+        finally:
+            client.close()
 
-        print("\n🚀 Running MongoDB Restore Command:")
-        print(" ".join(restore_cmd))
+        logger.info(
+            "🚀 Copying %d collections (%d at a time, readPreference=%s)",
+            len(collections), DUMP_WORKERS, DUMP_READ_PREFERENCE
+        )
 
-        subprocess.run(restore_cmd, check=True)
+        # Each worker only waits on its child processes, so threads are enough to run them side by side
+        with ThreadPoolExecutor(max_workers=DUMP_WORKERS) as executor:
+            list(executor.map(copy_collection, collections))
 
-        print(f"✔ Restore completed successfully to {SERVER_DB_NAME} on server")
+        logger.info("✔ Dump + restore completed successfully to %s on server", SERVER_DB_NAME)
 
     except FileNotFoundError:
-        print("❌ ERROR: 'mongorestore' not found. Install MongoDB Database Tools.")
+        logger.error("❌ ERROR: 'mongodump'/'mongorestore' not found. Install MongoDB Database Tools.")
         raise
     except subprocess.CalledProcessError as e:
-        print("❌ Restore failed:", e)
+        logger.error("❌ Dump/restore failed: %s", e)
         raise
 
 
@@ -95,17 +143,18 @@ def restore_to_server():
 # MAIN PROCESS
 # ------------------------------------------------------------------
 if __name__ == "__main__":
-    print("\n====================================================")
-    print("            🔄 MongoDB Backup & Restore Tool         ")
-    print("====================================================\n")
+    log_listener = setup_queue_logging()
+    logger.info("====================================================")
+    logger.info("            🔄 MongoDB Backup & Restore Tool         ")
+    logger.info("====================================================")
 
     try:
         dump_mongo_db()
-        restore_to_server()
 
-        print("\n🎉 DATABASE MIGRATION COMPLETED SUCCESSFULLY!")
+        logger.info("🎉 DATABASE MIGRATION COMPLETED SUCCESSFULLY!")
 
     except Exception as e:
-        print(f"\n❌ Process failed: {e}")
+        logger.error("❌ Process failed: %s", e)
 
-    print("\n====================================================\n")
+    finally:
+        log_listener.stop()
@@ -1,13 +1,38 @@
-from beanie import Document, Link, PydanticObjectId
-from pydantic import BaseModel, Field, field_validator, ConfigDict
-from typing import Optional, List, Any, Dict, Union, get_origin, get_args
+from beanie import Document, Link, PydanticObjectId, before_event, Insert, Replace, Save
+from bson import DBRef
+from pydantic import BaseModel, Discriminator, Field, Tag, field_validator, ConfigDict
+from typing import Annotated, Optional, List, Any, Dict, Iterable, Tuple, Union, get_origin, get_args
 
 from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import islice
+import types
 import uuid
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Annotations whose fields take part in search (int fields are matched exactly)
+_SEARCHABLE_TYPES = frozenset({str, int, Any})
+# typing.Optional/Union and PEP 604 `X | None` annotations have different origins
+_UNION_ORIGINS = (Union, types.UnionType)
+_NONE_TYPE = type(None)
+
+# Generic search excludes that work across models; can be extended if needed
+_EXCLUDE_FIELDS: frozenset[str] = frozenset({
+    "id", "_id", "revision_id",
+    "created_at", "updated_at",  # Timestamps
+    "client_workflow_id", "workflow_execution_log_id",  # Link fields (add more as needed)
+})
+
+def _related_document_kind(value: Any) -> str:
+    """Discriminator for related_document_models items: plain model name or relationship object"""
+    return "name" if isinstance(value, str) else "object"
+
+
+# Documents per insert_many call; keeps each batch well under the 16MB BSON message cap
+BULK_INSERT_CHUNK_SIZE = 1000
+
 # ─────────────────────────────────────────────
 # CLIENT_WORKFLOWS
 # ─────────────────────────────────────────────
@@ -19,15 +44,17 @@ class DocumentLink(BaseModel):
     target_field: str = Field(..., description="Field in target document that matches the reference")
     fuzzy: Optional[bool] = Field(default=False, description="Whether to use fuzzy matching for this link")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "target_model": "invoice",
                 "source_field": "invoice_id",
                 "target_field": "invoice_number",
                 "fuzzy": True
             }
-        }
+        },
+    )
 
 
 class LinkedDocumentModel(BaseModel):
@@ -39,8 +66,9 @@ class LinkedDocumentModel(BaseModel):
         description="List of links from this document to other documents (primary or other linked documents)"
     )
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "model": "grn",
                 "is_mandatory": False,
@@ -57,7 +85,8 @@ class LinkedDocumentModel(BaseModel):
                     }
                 ]
             }
-        }
+        },
+    )
 
 
 class RelatedDocumentModelWithLinks(BaseModel):
@@ -68,8 +97,9 @@ class RelatedDocumentModelWithLinks(BaseModel):
         description="Other document models that link to primary or each other"
     )
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "primary_model": "invoice",
                 "linked_models": [
@@ -102,7 +132,15 @@ class RelatedDocumentModelWithLinks(BaseModel):
                     }
                 ]
             }
-        }
+        },
+    )
+
+
+# Routed by type in one check instead of trying str, then the model, for every item
+RelatedDocumentEntryWithLinks = Annotated[
+    Union[Annotated[str, Tag("name")], Annotated[RelatedDocumentModelWithLinks, Tag("object")]],
+    Discriminator(_related_document_kind),
+]
 
 
 class ClientWorkflows(Document):
@@ -114,7 +152,7 @@ class ClientWorkflows(Document):
     expense_categories: Optional[List[str]] = Field(default_factory=list, description="List of expense categories")
     expense_filter: Optional[Dict[str, Any]] = Field(None, description="Expense filter conditions")
     agent_flow_definition: Optional[List[Dict[str, Any]]] = Field(default_factory=list, description="Definition of agent flow")
-    related_document_models: Optional[List[Union[str, RelatedDocumentModelWithLinks]]] = Field(
+    related_document_models: Optional[List[RelatedDocumentEntryWithLinks]] = Field(
         default_factory=list, 
         description="Related document models - can be simple strings or objects with relationship links (backward compatible)"
     )
@@ -128,13 +166,14 @@ class ClientWorkflows(Document):
     @classmethod
     def normalize_related_document_models(cls, v):
         """Convert single dict to list for backward compatibility"""
+        # Stored documents already hold a list, so that exact-type check goes first
+        if v.__class__ is list:
+            return v
         if v is None:
             return []
-        if isinstance(v, dict):
+        if v.__class__ is dict:
             # If it's a single dict with primary_model, wrap it in a list
             return [v]
-        if isinstance(v, list):
-            return v
         return []
 
     class Settings:
@@ -165,9 +204,15 @@ class ClientRules(Document):
     updated_by: Optional[str] = Field(None, description="User who last updated the rule")
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    search_norm: Dict[str, str] = Field(default_factory=dict, description="Lower-cased copies of the searchable text fields (maintained on write)")
+
+    @before_event(Insert, Replace, Save)
+    def refresh_search_norm(self):
+        self.search_norm = build_search_norm(self)
 
     class Settings:
         name = "client_rules"  # Collection name for client rules
+        indexes = ["client_workflow_id"]  # Rule search filters on the workflow
 
 
 # ─────────────────────────────────────────────
@@ -175,6 +220,8 @@ class ClientRules(Document):
 # ─────────────────────────────────────────────
 
 class WorkflowContext(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     triggered_by: str = Field(..., description="User or system that triggered the workflow")
 
 class WorkflowExecutionLogs(Document):
@@ -189,9 +236,25 @@ class WorkflowExecutionLogs(Document):
     updated_by: Optional[str] = Field(None, description="User who last updated the execution log")
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    search_norm: Dict[str, str] = Field(default_factory=dict, description="Lower-cased copies of the searchable text fields (maintained on write)")
+
+    @before_event(Insert, Replace, Save)
+    def refresh_search_norm(self):
+        self.search_norm = build_search_norm(self)
+
+    @classmethod
+    async def bulk_create(cls, docs: Iterable["WorkflowExecutionLogs"], chunk_size: int = BULK_INSERT_CHUNK_SIZE):
+        """Insert many logs in unordered insert_many batches instead of one round trip per log"""
+        it = iter(docs)
+        while batch := list(islice(it, chunk_size)):
+            # insert_many skips event actions, so keep search_norm in step here
+            for doc in batch:
+                doc.refresh_search_norm()
+            await cls.insert_many(batch, ordered=False)
 
     class Settings:
         name = "workflow_execution_logs"  # Collection name for workflow execution logs
+        indexes = ["central_workflow_id"]  # Log search filters on the central workflow
 
 
 # ─────────────────────────────────────────────
@@ -202,11 +265,18 @@ class RelatedDocumentModel(BaseModel):
     model: str = Field(..., alias="model_type")
     id: str = Field(..., alias="model_id")
     
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+
+
+RelatedDocumentEntry = Annotated[
+    Union[Annotated[str, Tag("name")], Annotated[RelatedDocumentModel, Tag("object")]],
+    Discriminator(_related_document_kind),
+]
 
 
 class ProcessLogStep(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     step: str
     status: str
 
@@ -219,8 +289,9 @@ class RuleExecutionOutput(BaseModel):
     suggested_resolution: Optional[str] = Field(None, description="Suggested resolution if rule failed")
     breach_level: Optional[Union[str, int]] = Field(None, description="Severity level of breach (low, medium, high, critical) or priority number")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "client_rule_id": "673a1b2c3d4e5f6a7b8c9d0e",
                 "passed": False,
@@ -228,21 +299,22 @@ class RuleExecutionOutput(BaseModel):
                 "suggested_resolution": "Require manager approval",
                 "breach_level": "medium"
             }
-        }
+        },
+    )
 
 
 class AgentExecutionLogs(Document):
 
     model_config = ConfigDict(extra="allow")
 
-    workflow_execution_log_id: Link[WorkflowExecutionLogs]
+    workflow_execution_log_id: PydanticObjectId = Field(..., description="WorkflowExecutionLogs ObjectId")
     workflow_id: Optional[str] = Field(None, description="Workflow ID reference")
     agent_id: Optional[Union[str, PydanticObjectId]] = Field(..., description="Agent unique identifier (ObjectId or string for backward compatibility)")
     status: Optional[str] = Field(None, description="Execution status (success, failed, pending, etc.)")
     user_output: Optional[str] = Field(None, description="Readable output message for users")
     error_output: Optional[str] = Field(None, description="Error details if execution failed")
     process_log: Optional[List[ProcessLogStep]] = Field(default_factory=list, description="Step-by-step execution log")
-    related_document_models: Optional[List[Union[str, RelatedDocumentModel]]] = Field(
+    related_document_models: Optional[List[RelatedDocumentEntry]] = Field(
         default_factory=list,
         description="List of related document models (backward-compatible: strings or objects)",
     )
@@ -258,42 +330,84 @@ class AgentExecutionLogs(Document):
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+    @field_validator('workflow_execution_log_id', mode='before')
+    @classmethod
+    def unwrap_workflow_link(cls, v):
+        """Accept the DBRef / Link form older logs were stored with"""
+        if isinstance(v, Link):
+            v = v.ref
+        if isinstance(v, DBRef):
+            return v.id
+        return v
+
+    @classmethod
+    async def with_workflow(cls, log_id: PydanticObjectId) -> List[Dict[str, Any]]:
+        """Agent logs of one workflow execution joined with that execution, in a single query"""
+        return await cls.aggregate([
+            {"$match": {"workflow_execution_log_id": log_id}},
+            {"$lookup": {
+                "from": WorkflowExecutionLogs.Settings.name,
+                "localField": "workflow_execution_log_id",
+                "foreignField": "_id",
+                "as": "workflow",
+            }},
+        ]).to_list()
+
+    @classmethod
+    async def bulk_create(cls, docs: Iterable["AgentExecutionLogs"], chunk_size: int = BULK_INSERT_CHUNK_SIZE):
+        """Insert many logs in unordered insert_many batches instead of one round trip per log"""
+        it = iter(docs)
+        while batch := list(islice(it, chunk_size)):
+            await cls.insert_many(batch, ordered=False)
+
     class Settings:
         name = "agent_execution_logs"  # Collection name for agent execution logs
+        indexes = [
+            "workflow_id",  # Agent log search filters on the workflow
+            "workflow_execution_log_id",  # with_workflow matches on the parent execution
+        ]
 
 
-def get_searchable_string_fields(model_class) -> List[str]:
+@lru_cache(maxsize=None)
+def get_searchable_string_fields(model_class) -> Tuple[str, ...]:
     """
     Dynamically extract searchable field names from a Pydantic/Beanie model.
     Includes: string fields and integer fields (for exact matching)
     Excludes: id, timestamps, Link fields, List fields, Dict fields
+    The result only depends on the class, so it is computed once per model and returned as a tuple.
     """
     searchable_fields = []
     
-    # Generic excludes that work across models; can be extended if needed
-    exclude_fields = {
-        "id", "_id", "revision_id", 
-        "created_at", "updated_at",  # Timestamps
-        "client_workflow_id", "workflow_execution_log_id",  # Link fields (add more as needed)
-    }
-    
     for field_name, field_info in model_class.model_fields.items():
-        if field_name in exclude_fields:
+        if field_name in _EXCLUDE_FIELDS:
             continue
         
         annotation = field_info.annotation
         origin = get_origin(annotation)
         
-        # Handle Optional[X] (Union[X, None])
-        if origin is Union:
+        # Handle Optional[X] (Union[X, None] or X | None)
+        if origin in _UNION_ORIGINS:
             args = get_args(annotation)
-            non_none_types = [arg for arg in args if arg is not type(None)]
+            non_none_types = [arg for arg in args if arg is not _NONE_TYPE]
             for arg_type in non_none_types:
                 # Include str, int, and Any types
-                if arg_type is str or arg_type is int or arg_type is Any or str(arg_type) == 'typing.Any':
+                if arg_type in _SEARCHABLE_TYPES:
                     searchable_fields.append(field_name)
                     break
-        elif annotation is str or annotation is int or annotation is Any or str(annotation) == 'typing.Any':
+        elif annotation in _SEARCHABLE_TYPES:
             searchable_fields.append(field_name)
     
-    return searchable_fields
\ No newline at end of file
+    return tuple(searchable_fields)
+
+
+def build_search_norm(document) -> Dict[str, str]:
+    """
+    Lower-cased copies of a document's searchable string fields.
+    Stored alongside the document so fuzzy search does not re-normalize every candidate per request.
+    """
+    norms = {}
+    for field_name in get_searchable_string_fields(type(document)):
+        value = getattr(document, field_name, None)
+        if isinstance(value, str):
+            norms[field_name] = value.lower()
+    return norms
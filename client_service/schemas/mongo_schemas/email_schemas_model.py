@@ -1,24 +1,66 @@
 #ginthi_agents/client_service/schemas/mongo_schemas/email_schemas_model.py
 from beanie import Document
-from datetime import datetime
-from pydantic import Field
+from datetime import datetime, timedelta, timezone
+from pydantic import BaseModel, Field, model_validator
+from pymongo import IndexModel
+from pymongo.collation import Collation
 from typing import Optional
+
+# Template names are unique regardless of case; lookups must use the same collation to hit the index.
+# Existing databases: run scripts/dedupe_template_names.py first, or the index build fails at startup
+TEMPLATE_NAME_COLLATION = Collation(locale="en", strength=2)
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class TemplateSummary(BaseModel):
+    """Listing fields of a template (no body)"""
+    template_name: str
+    channel: str
+    subject: Optional[str] = None
+    status: str = "active"
+
+
 class NotificationTemplateModel(Document):
     template_name: str
     channel: str  # email / whatsapp / notification
     subject: Optional[str] = None
     body: str
     status: str = "active"
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utc_now)
+    updated_at: datetime = Field(default_factory=_utc_now)
+
+    @model_validator(mode="before")
+    @classmethod
+    def default_timestamps(cls, data):
+        """New templates get one timestamp for both fields instead of two clock reads"""
+        if isinstance(data, dict) and "updated_at" not in data:
+            data = dict(data)
+            data["updated_at"] = data.setdefault("created_at", _utc_now())
+        return data
 
     class Settings:
         name = "templates"
+        # Templates change rarely; Beanie serves repeated lookups from memory instead of a
+        # round trip on the shared client pool per notification
+        use_cache = True
+        cache_expiration_time = timedelta(minutes=5)
+        cache_capacity = 1024
+        indexes = [
+            IndexModel([("template_name", 1)], unique=True, collation=TEMPLATE_NAME_COLLATION)
+        ]
 
     @classmethod
     async def get_by_name(cls, name: str):
-        return await cls.find_one({"template_name": name})
+        return await cls.find_one({"template_name": name}, collation=TEMPLATE_NAME_COLLATION)
+
+    @classmethod
+    async def list_summaries(cls, limit: int = 100, skip: int = 0):
+        return await cls.find_all(skip=skip, limit=limit).project(TemplateSummary).to_list()
 
     @classmethod
-    async def list_all(cls):
-        return await cls.find_all().to_list()
+    def iter_all(cls):
+        """Cursor over every template, for `async for` without materializing the collection"""
+        return cls.find_all()
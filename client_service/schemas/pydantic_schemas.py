@@ -3,11 +3,15 @@ from __future__ import annotations
 import uuid
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Any, Dict, List, Optional, Union
+from typing import Annotated, Any, Dict, List, Optional, Union
 from uuid import UUID
 
 from beanie import Document, Indexed
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, EmailStr, Field, StringConstraints, field_validator
+
+# Free-text request fields are capped so a malformed payload cannot store unbounded strings;
+# stored documents are not capped, so older long values still load
+FreeText = Annotated[str, StringConstraints(max_length=65_536)]
 
 # ==================== CENTRAL CLIENT SCHEMAS ====================
 
@@ -1299,10 +1303,10 @@ class RuleExecutionOutput(BaseModel):
         ..., description="Reference to the client rule ObjectId (24-char hex string)"
     )
     passed: bool = Field(..., description="Whether the rule validation passed")
-    user_output: Optional[str] = Field(
+    user_output: Optional[FreeText] = Field(
         None, description="Human-readable output for this rule"
     )
-    suggested_resolution: Optional[str] = Field(
+    suggested_resolution: Optional[FreeText] = Field(
         None, description="Suggested resolution if rule failed"
     )
     breach_level: Optional[Union[str, int]] = Field(
@@ -1453,7 +1457,7 @@ class ClientWorkflowCreate(BaseModel):
     central_module_id: Optional[str] = Field(
         None, description="Reference to central module ID"
     )
-    description: Optional[str] = Field(
+    description: Optional[FreeText] = Field(
         None, description="Short description of the workflow"
     )
     expense_categories: Optional[List[str]] = Field(
@@ -1532,7 +1536,7 @@ class ClientWorkflowUpdate(BaseModel):
     """Schema for updating an existing client workflow"""
 
     name: Optional[str] = Field(None, description="Updated name of the client workflow")
-    description: Optional[str] = Field(
+    description: Optional[FreeText] = Field(
         None, description="Updated description of the workflow"
     )
     expense_categories: Optional[List[str]] = Field(
@@ -1638,10 +1642,10 @@ class ClientRuleCreate(BaseModel):
         description="Agent responsible for executing this rule (can be string or ObjectId)",
         example="653f3c9fd4e5f6c123456789",
     )
-    prompt: Optional[str] = Field(
+    prompt: Optional[FreeText] = Field(
         None, description="Prompt logic or condition for the rule"
     )
-    issue_description: Optional[str] = Field(
+    issue_description: Optional[FreeText] = Field(
         None, description="Detailed description of the issue"
     )
     issue_priority: Optional[int] = Field(
@@ -1701,8 +1705,8 @@ class ClientRuleUpdate(BaseModel):
     """Schema for updating a client rule"""
 
     name: Optional[str] = Field(None, description="Updated rule name")
-    prompt: Optional[str] = Field(None, description="Updated prompt logic or condition")
-    issue_description: Optional[str] = Field(
+    prompt: Optional[FreeText] = Field(None, description="Updated prompt logic or condition")
+    issue_description: Optional[FreeText] = Field(
         None, description="Updated issue description"
     )
     issue_priority: Optional[int] = Field(None, description="Updated issue priority")
@@ -1915,12 +1919,12 @@ class AgentExecutionLogCreate(BaseModel):
     status: Optional[str] = Field(
         None, description="Execution status", example="success"
     )
-    user_output: Optional[str] = Field(
+    user_output: Optional[FreeText] = Field(
         None,
         description="Readable output message generated by the agent",
         example="Invoice validated successfully",
     )
-    error_output: Optional[str] = Field(
+    error_output: Optional[FreeText] = Field(
         None, description="Error details if the execution failed", example="None"
     )
     process_log: List[ProcessLogStep] = Field(
@@ -1941,7 +1945,7 @@ class AgentExecutionLogCreate(BaseModel):
         description="List of related document models",
         example=[{"model": "invoice", "id": "document-id-1"}],
     )
-    user_feedback: Optional[str] = Field(
+    user_feedback: Optional[FreeText] = Field(
         None,
         description="Feedback provided by the user on the output",
         example="Looks good",
@@ -2000,11 +2004,11 @@ class AgentExecutionLogUpdate(BaseModel):
     """Schema for updating an agent execution log"""
 
     status: Optional[str] = Field(None, description="Updated execution status")
-    user_output: Optional[str] = Field(
+    user_output: Optional[FreeText] = Field(
         None, description="Updated readable output message"
     )
-    error_output: Optional[str] = Field(None, description="Updated error details")
-    user_feedback: Optional[str] = Field(None, description="Updated user feedback")
+    error_output: Optional[FreeText] = Field(None, description="Updated error details")
+    user_feedback: Optional[FreeText] = Field(None, description="Updated user feedback")
     process_log: Optional[List[ProcessLogStep]] = Field(
         None, description="Updated step-by-step process log"
     )
@@ -2166,13 +2170,13 @@ class TemplateCreateRequest(BaseModel):
     template_name: str
     channel: str
     subject: Optional[str] = None
-    body: str
+    body: FreeText
     status: Optional[str] = "active"
     metadata: Optional[Dict[str, Any]] = None
 
 
 class TemplateUpdateRequest(BaseModel):
     subject: Optional[str] = None
-    body: Optional[str] = None
+    body: Optional[FreeText] = None
     status: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
@@ -0,0 +1,66 @@
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from client_service.db.mongo_db import db  # motor client is initialized by module import
+from client_service.schemas.mongo_schemas.email_schemas_model import (
+    NotificationTemplateModel,
+    TEMPLATE_NAME_COLLATION,
+)
+
+
+async def find_case_duplicates(collection):
+    """Groups of templates whose names differ only by case (compared with the index collation)"""
+    pipeline = [
+        {"$sort": {"updated_at": -1, "_id": -1}},
+        {"$group": {
+            "_id": "$template_name",
+            "ids": {"$push": "$_id"},
+            "names": {"$push": "$template_name"},
+            "count": {"$sum": 1},
+        }},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    cursor = collection.aggregate(pipeline, collation=TEMPLATE_NAME_COLLATION)
+    return [group async for group in cursor]
+
+
+async def dedupe_template_names(merge: bool):
+    """
+    Report templates that would break the unique, case-insensitive template_name index.
+    With merge, the most recently updated template of each group is kept and the rest deleted.
+    Run before starting a release with that index against an existing database.
+    """
+    collection = db[NotificationTemplateModel.Settings.name]
+    groups = await find_case_duplicates(collection)
+
+    if not groups:
+        print("No case-duplicate template names found")
+        return
+
+    deleted = 0
+    for group in groups:
+        keep_id, drop_ids = group["ids"][0], group["ids"][1:]
+        print(f"{group['names']}: keeping {group['names'][0]!r} ({keep_id})")
+        if merge:
+            result = await collection.delete_many({"_id": {"$in": drop_ids}})
+            deleted += result.deleted_count
+
+    if merge:
+        print(f"Deleted {deleted} duplicate templates")
+    else:
+        print(f"Found {len(groups)} case-duplicate template names; re-run with --merge to keep the latest of each")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--merge", action="store_true", help="Delete all but the most recently updated template per name")
+    args = parser.parse_args()
+    asyncio.run(dedupe_template_names(args.merge))
+
+
+if __name__ == "__main__":
+    main()
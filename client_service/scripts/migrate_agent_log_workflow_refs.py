@@ -0,0 +1,48 @@
+import asyncio
+import os
+import sys
+
+from bson import DBRef
+from pymongo import UpdateOne
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from client_service.db.mongo_db import db  # motor client is initialized by module import
+from client_service.schemas.mongo_schemas.client_workflow_execution import AgentExecutionLogs
+
+BATCH_SIZE = 1000
+
+
+async def migrate_workflow_refs():
+    """Rewrite agent logs whose workflow_execution_log_id is still a DBRef to a plain ObjectId"""
+    collection = db[AgentExecutionLogs.Settings.name]
+    cursor = collection.find(
+        {"workflow_execution_log_id": {"$type": "object"}},
+        projection={"workflow_execution_log_id": 1},
+    )
+
+    updated = 0
+    ops = []
+    async for doc in cursor:
+        ref = doc["workflow_execution_log_id"]
+        if not isinstance(ref, DBRef):
+            continue
+        ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"workflow_execution_log_id": ref.id}}))
+        if len(ops) >= BATCH_SIZE:
+            result = await collection.bulk_write(ops, ordered=False)
+            updated += result.modified_count
+            ops = []
+
+    if ops:
+        result = await collection.bulk_write(ops, ordered=False)
+        updated += result.modified_count
+
+    print(f"Migrated {updated} agent execution logs")
+
+
+def main():
+    asyncio.run(migrate_workflow_refs())
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,6 @@ from datetime import datetime, timezone
 from beanie import PydanticObjectId
 from bson import ObjectId
 from fastapi import HTTPException
-from rapidfuzz import fuzz
 import logging
 
 from client_service.schemas.mongo_schemas.client_workflow_execution import ClientRules, ClientWorkflows
@@ -16,6 +15,7 @@ from client_service.schemas.pydantic_schemas import (
 from client_service.schemas.base_response import APIResponse
 from client_service.api.constants.status_codes import StatusCode
 from client_service.api.constants.messages import ClientRuleMessages
+from client_service.utils.fuzzy_search import fuzzy_column_scores
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -140,12 +140,21 @@ class ClientRulesService:
     # READ: Get All
     # ─────────────────────────────
     @staticmethod
-    async def get_all_rules(skip: int = 0, limit: int = 50) -> APIResponse:
-        """Retrieve all client rules with pagination"""
-        logger.info("Retrieving client rules with pagination: skip=%s, limit=%s", skip, limit)
+    async def get_all_rules(skip: int = 0, limit: int = 50, after_id: Optional[str] = None) -> APIResponse:
+        """
+        Retrieve all client rules with pagination
+        Pass the last returned rule's id as after_id for keyset paging (skip is ignored then)
+        """
+        logger.info("Retrieving client rules with pagination: skip=%s, limit=%s, after_id=%s", skip, limit, after_id)
         try:
             # Fetch paginated rules
-            rules = await ClientRules.find_all().skip(skip).limit(limit).to_list()
+            if after_id:
+                # Range scan on _id - cost does not grow with page depth
+                rules = await ClientRules.find(
+                    {"_id": {"$gt": PydanticObjectId(after_id)}}
+                ).sort("_id").limit(limit).to_list()
+            else:
+                rules = await ClientRules.find_all().sort("_id").skip(skip).limit(limit).to_list()
 
             logger.info("Retrieved %d client rules (paginated)", len(rules))
             normalized = []
@@ -246,8 +255,15 @@ class ClientRulesService:
             # Build query filter
             query_filter = {"client_workflow_id": PydanticObjectId(client_workflow_id)}
             
-            # Get rules filtered by workflow_id
-            all_rules = await ClientRules.find(query_filter).to_list()
+            # Only the searched columns are fetched for scoring; full documents are loaded for the top matches
+            search_columns = [column for column, value in ((column1, value1), (column2, value2)) if column and value]
+            all_rules = await ClientRules.find(query_filter).aggregate(
+                [{"$project": {
+                    "_id": 1,
+                    **{column: 1 for column in search_columns},
+                    **{f"search_norm.{column}": 1 for column in search_columns},
+                }}]
+            ).to_list()
             
             if not all_rules:
                 logger.info(f"No rules found for workflow_id: {client_workflow_id}")
@@ -257,77 +273,46 @@ class ClientRulesService:
                     data=[]
                 )
             
+            # Score each searched column over all rules in one batched call
+            scores1 = (
+                fuzzy_column_scores(
+                    value1, [rule.get(column1) for rule in all_rules], threshold,
+                    normalized=[rule.get("search_norm", {}).get(column1) for rule in all_rules]
+                )
+                if column1 and value1 else None
+            )
+            scores2 = (
+                fuzzy_column_scores(
+                    value2, [rule.get(column2) for rule in all_rules], threshold,
+                    normalized=[rule.get("search_norm", {}).get(column2) for rule in all_rules]
+                )
+                if column2 and value2 else None
+            )
+            
             matches = []
             
-            # Handle different search modes
-            for rule in all_rules:
+            # A rule matches when every searched column meets the threshold
+            # (no columns provided: return all for this workflow)
+            for idx, rule in enumerate(all_rules):
                 match_scores = {}
-                is_match = True
                 
-                # Check column1 if provided
-                if column1 and value1:
-                    rule_value1 = getattr(rule, column1, None)
-                    if rule_value1 is not None:
-                        # For integer fields, use exact match; for strings, use fuzzy match
-                        if isinstance(rule_value1, int):
-                            try:
-                                # Try to convert search value to int for exact comparison
-                                search_int = int(value1)
-                                score1 = 100 if rule_value1 == search_int else 0
-                            except ValueError:
-                                # If value1 is not a valid int, no match
-                                score1 = 0
-                        else:
-                            # String fuzzy matching
-                            score1 = fuzz.partial_ratio(
-                                value1.lower(), 
-                                str(rule_value1).lower()
-                            )
-                        match_scores["score1"] = score1
-                        if score1 < threshold:
-                            is_match = False
-                    else:
-                        is_match = False
+                if scores1 is not None:
+                    if idx not in scores1:
+                        continue
+                    match_scores["score1"] = scores1[idx]
                 
-                # Check column2 if provided
-                if column2 and value2:
-                    rule_value2 = getattr(rule, column2, None)
-                    if rule_value2 is not None:
-                        # For integer fields, use exact match; for strings, use fuzzy match
-                        if isinstance(rule_value2, int):
-                            try:
-                                # Try to convert search value to int for exact comparison
-                                search_int = int(value2)
-                                score2 = 100 if rule_value2 == search_int else 0
-                            except ValueError:
-                                # If value2 is not a valid int, no match
-                                score2 = 0
-                        else:
-                            # String fuzzy matching
-                            score2 = fuzz.partial_ratio(
-                                value2.lower(), 
-                                str(rule_value2).lower()
-                            )
-                        match_scores["score2"] = score2
-                        if score2 < threshold:
-                            is_match = False
-                    else:
-                        is_match = False
+                if scores2 is not None:
+                    if idx not in scores2:
+                        continue
+                    match_scores["score2"] = scores2[idx]
                 
-                # If no columns provided, it's a match (return all for this workflow)
-                if not column1 and not column2:
-                    is_match = True
-                    matches.append({
-                        "rule": rule,
-                        "scores": match_scores  # Empty scores
-                    })
-                elif is_match:
-                    matches.append({
-                        "rule": rule,
-                        "scores": match_scores
-                    })
+                matches.append({
+                    "id": rule["_id"],
+                    "scores": match_scores
+                })
+                if match_scores:
                     logger.debug(
-                        f"Match found: {rule.name} (scores: {match_scores})"
+                        f"Match found: {rule['_id']} (scores: {match_scores})"
                     )
             
             # Sort by highest score (prefer score1 if both, else score2, else arbitrary)
@@ -353,6 +338,14 @@ class ClientRulesService:
                     data=[]
                 )
             
+            # Load the full documents for the top matches only, keeping the ranked order
+            top_docs = await ClientRules.find({"_id": {"$in": [match["id"] for match in top_matches]}}).to_list()
+            docs_by_id = {doc.id: doc for doc in top_docs}
+            top_matches = [
+                {"rule": docs_by_id[match["id"]], "scores": match["scores"]}
+                for match in top_matches if match["id"] in docs_by_id
+            ]
+            
             # Format response - handle type conversion
             results = []
             for match in top_matches:
@@ -1,12 +1,14 @@
 # client_service/services/notification_service.py
 import json
+import asyncio
 import logging
+from typing import List, Tuple
 import requests
 from fastapi import HTTPException
-from botocore.exceptions import ClientError
+from async_lru import alru_cache
 
 from client_service.config import (
-    ses_client,
+    get_sesv2_client,
     EUM_SMS_API_KEY,
     EUM_SMS_SENDER_ID,
     EUM_SMS_API_URL,
@@ -28,12 +30,133 @@ from client_service.utils.pydantic_utils import map_to_pydantic
 
 logger = logging.getLogger(__name__)
 
+# Concurrent email sends are coalesced into one SES bulk call (SES allows up to 50 destinations)
+EMAIL_BATCH_WINDOW_SECONDS = 0.05
+EMAIL_BATCH_MAX_SIZE = 50
+
+# Subject/body are rendered locally, so the bulk template only passes them through
+# (triple braces: no HTML escaping)
+_PASSTHROUGH_TEMPLATE = {
+    "Subject": "{{{subject}}}",
+    "Html": "{{{body}}}",
+    "Text": "{{{body}}}",
+}
+
+
+class BulkEmailBatcher:
+    """Collects emails sent within a short window and delivers them with one SES SendBulkEmail call"""
+
+    def __init__(self, window: float = EMAIL_BATCH_WINDOW_SECONDS, max_size: int = EMAIL_BATCH_MAX_SIZE):
+        self.window = window
+        self.max_size = max_size
+        self._queue: asyncio.Queue = None
+        self._worker: asyncio.Task = None
+
+    async def send(self, to_email: str, subject: str, body: str) -> str:
+        """Queue one email and wait for its SES message id"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((to_email, subject, body, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                results = await asyncio.to_thread(self._deliver, [item[:3] for item in batch])
+            except Exception as e:
+                results = [{"Status": "FAILED", "Error": str(e)}] * len(batch)
+
+            # Every caller gets an answer, even if SES returned fewer results than entries
+            results = list(results) + [{"Status": "FAILED", "Error": "No result returned"}] * (len(batch) - len(results))
+
+            for (_, _, _, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if result.get("Status") == "SUCCESS":
+                    future.set_result(result.get("MessageId"))
+                else:
+                    error = result.get("Error") or result.get("Status")
+                    logger.error(NotificationMessages.EMAIL_SEND_ERROR.format(error=error))
+                    future.set_exception(HTTPException(
+                        status_code=400,
+                        detail=NotificationMessages.EMAIL_SEND_ERROR.format(error=error)
+                    ))
+
+    @classmethod
+    def _deliver(cls, batch: List[Tuple[str, str, str]]) -> list:
+        """
+        Send a batch with one bulk call. If the call itself fails (throttling, a request-level
+        validation error from one bad recipient, a botocore error), retry the entries one at a
+        time so each send still succeeds or fails on its own.
+        """
+        try:
+            return cls._send_batch(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                return [{"Status": "FAILED", "Error": str(e)}]
+            logger.warning(f"Bulk email call failed for {len(batch)} entries, retrying individually: {e}")
+
+        results = []
+        for entry in batch:
+            try:
+                results.extend(cls._send_batch([entry])[:1] or [{"Status": "FAILED", "Error": "No result returned"}])
+            except Exception as e:
+                results.append({"Status": "FAILED", "Error": str(e)})
+        return results
+
+    @staticmethod
+    def _send_batch(batch: List[Tuple[str, str, str]]) -> list:
+        response = get_sesv2_client().send_bulk_email(
+            FromEmailAddress=SES_SENDER_EMAIL,
+            DefaultContent={
+                "Template": {
+                    "TemplateContent": _PASSTHROUGH_TEMPLATE,
+                    "TemplateData": json.dumps({"subject": "", "body": ""}),
+                }
+            },
+            BulkEmailEntries=[
+                {
+                    "Destination": {"ToAddresses": [to_email]},
+                    "ReplacementEmailContent": {
+                        "ReplacementTemplate": {
+                            "ReplacementTemplateData": json.dumps({"subject": subject, "body": body})
+                        }
+                    },
+                }
+                for to_email, subject, body in batch
+            ],
+        )
+        # Results come back in entry order
+        return response.get("BulkEmailEntryResults", [])
+
+
+_email_batcher = BulkEmailBatcher()
+
 
 class NotificationService:
 
+    # Templates change rarely, so reads are served from memory for up to a minute
+    @alru_cache(maxsize=512, ttl=60)
     async def list_templates(self) -> APIResponse:
-        templates = await NotificationTemplateModel.list_all()
-        response_data = [map_to_pydantic(TemplateResponse, t.dict()) for t in templates]
+        response_data = [
+            map_to_pydantic(TemplateResponse, t.dict())
+            async for t in NotificationTemplateModel.iter_all()
+        ]
         logger.info(NotificationMessages.TEMPLATE_LIST_SUCCESS.format(count=len(response_data)))
         return APIResponse(
             success=True,
@@ -41,6 +164,7 @@ class NotificationService:
             data=response_data
         )
 
+    @alru_cache(maxsize=512, ttl=60)
     async def get_template(self, name: str) -> APIResponse:
         template = await NotificationTemplateModel.get_by_name(name)
         if not template:
@@ -79,15 +203,15 @@ class NotificationService:
                 detail=NotificationMessages.TEMPLATE_VARIABLE_ERROR
             )
 
-        # Select channel
+        # Select channel (blocking SDK / HTTP calls run in worker threads, off the event loop)
         if request.channel == "email":
-            message_id = self._send_email(request.recipient, subject, body)
+            message_id = await _email_batcher.send(request.recipient, subject, body)
 
         elif request.channel == "sms":
-            message_id = self._send_sms(request.recipient, body)
+            message_id = await asyncio.to_thread(self._send_sms, request.recipient, body)
 
         elif request.channel == "whatsapp":
-            message_id = self._send_whatsapp(request.recipient, body)
+            message_id = await asyncio.to_thread(self._send_whatsapp, request.recipient, body)
 
         elif request.channel == "notification":
             message_id = "push_notification_mock"
@@ -108,24 +232,6 @@ class NotificationService:
         )
     
     # ---------- Internal senders ----------
-    def _send_email(self, to_email: str, subject: str, body: str):
-        try:
-            response = ses_client.send_email(
-                Source=SES_SENDER_EMAIL,
-                Destination={"ToAddresses": [to_email]},
-                Message={
-                    "Subject": {"Data": subject},
-                    "Body": {"Html": {"Data": body}, "Text": {"Data": body}}
-                },
-            )
-            return response.get("MessageId")
-        except ClientError as e:
-            logger.error(NotificationMessages.EMAIL_SEND_ERROR.format(error=str(e)))
-            raise HTTPException(
-                status_code=400,
-                detail=NotificationMessages.EMAIL_SEND_ERROR.format(error=str(e))
-            )
-
     def _send_sms(self, phone_number: str, body: str):
         try:
             headers = {
@@ -1,5 +1,6 @@
 import logging
 from datetime import datetime
+from typing import Optional
 from bson import ObjectId
 
 from client_service.api.constants.messages import TransactionLogMessages
@@ -11,6 +12,9 @@ from fastapi import HTTPException
 
 logger = logging.getLogger(__name__)
 
+# Large per-request fields left out of list pages by default
+LIST_EXCLUDED_FIELDS = {"headers": 0, "request_body": 0}
+
 
 class TransactionLogService:
     """Service for managing transaction logs stored in MongoDB"""
@@ -77,6 +81,8 @@ class TransactionLogService:
     async def get_all(
         skip: int = 0,
         limit: int = 100,
+        include_payloads: bool = False,
+        after_id: Optional[str] = None,
     ) -> APIResponse:
         """
         Retrieve all transaction logs with pagination.
@@ -84,28 +90,58 @@ class TransactionLogService:
         Args:
             skip: Number of records to skip (pagination)
             limit: Maximum number of records to return
+            include_payloads: Include the heavy headers / request_body fields
+            after_id: Keyset cursor - the previous page's next_cursor (skip is ignored then)
             
         Returns:
             APIResponse with list of transaction logs
         """
         try:
+            # Validate cursor format
+            cursor_id = None
+            if after_id:
+                try:
+                    cursor_id = ObjectId(after_id)
+                except Exception:
+                    raise HTTPException(
+                        status_code=StatusCode.BAD_REQUEST,
+                        detail=f"Invalid after_id format: {after_id}",
+                    )
+
             # Get MongoDB database
             db = await get_db()
             collection_name = TransactionLogModel.Settings.name
             collection = db[collection_name]
 
+            # Both paths page on (timestamp, _id) newest first: ObjectIds from several workers in the
+            # same second are not in timestamp order, so _id alone cannot continue a timestamp page
+            query = {}
+            if cursor_id is not None:
+                anchor = await collection.find_one({"_id": cursor_id}, {"timestamp": 1})
+                if anchor is None:
+                    raise HTTPException(
+                        status_code=StatusCode.BAD_REQUEST,
+                        detail=f"Invalid after_id: {after_id}",
+                    )
+                query = {"$or": [
+                    {"timestamp": {"$lt": anchor.get("timestamp")}},
+                    {"timestamp": anchor.get("timestamp"), "_id": {"$lt": cursor_id}},
+                ]}
+
             # Get total count
             total_count = await collection.count_documents({})
 
             # Fetch logs with pagination
-            cursor = (
-                collection.find({})
-                .sort("timestamp", -1)  # Most recent first
-                .skip(skip)
-                .limit(min(limit, 100))  # Max 100 per request
-            )
+            # The whole page comes back in one batch; payload fields are skipped unless asked for
+            page_size = min(limit, 100)  # Max 100 per request
+            projection = None if include_payloads else LIST_EXCLUDED_FIELDS
+            cursor = collection.find(query, projection).sort([("timestamp", -1), ("_id", -1)])  # Most recent first
+            if cursor_id is None:
+                cursor = cursor.skip(skip)
+            # Keyset pages are an index range scan - cost does not grow with page depth
+            cursor = cursor.limit(page_size).batch_size(page_size)
 
-            logs = await cursor.to_list(length=limit)
+            logs = await cursor.to_list(length=page_size)
 
             # Process logs for JSON serialization
             for log in logs:
@@ -129,6 +165,7 @@ class TransactionLogService:
                         "skip": skip,
                         "limit": limit,
                         "returned": len(logs),
+                        "next_cursor": logs[-1]["_id"] if len(logs) == page_size else None,
                     },
                 },
             )
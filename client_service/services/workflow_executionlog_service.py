@@ -2,7 +2,6 @@ from typing import List, Optional
 from datetime import datetime, timezone
 from beanie import PydanticObjectId
 from fastapi import HTTPException
-from rapidfuzz import fuzz
 import logging
 
 from client_service.schemas.mongo_schemas.client_workflow_execution import WorkflowExecutionLogs
@@ -14,6 +13,7 @@ from client_service.schemas.pydantic_schemas import (
 from client_service.schemas.base_response import APIResponse
 from client_service.api.constants.status_codes import StatusCode
 from client_service.api.constants.messages import WorkflowExecutionLogMessages
+from client_service.utils.fuzzy_search import fuzzy_column_scores
 
 logger = logging.getLogger(__name__)
 
@@ -87,11 +87,20 @@ class WorkflowExecutionLogService:
     # GET ALL
     # ─────────────────────────────
     @staticmethod
-    async def get_all_logs(skip: int = 0, limit: int = 50) -> APIResponse:
-        """Retrieve all workflow execution logs with pagination"""
-        logger.info("Retrieving workflow execution logs (skip=%d, limit=%d)", skip, limit)
+    async def get_all_logs(skip: int = 0, limit: int = 50, after_id: Optional[str] = None) -> APIResponse:
+        """
+        Retrieve all workflow execution logs with pagination
+        Pass the last returned log's id as after_id for keyset paging (skip is ignored then)
+        """
+        logger.info("Retrieving workflow execution logs (skip=%d, limit=%d, after_id=%s)", skip, limit, after_id)
         try:
-            logs = await WorkflowExecutionLogs.find_all().skip(skip).limit(limit).to_list()
+            if after_id:
+                # Range scan on _id - cost does not grow with page depth
+                logs = await WorkflowExecutionLogs.find(
+                    {"_id": {"$gt": PydanticObjectId(after_id)}}
+                ).sort("_id").limit(limit).to_list()
+            else:
+                logs = await WorkflowExecutionLogs.find_all().sort("_id").skip(skip).limit(limit).to_list()
             count = len(logs)
             logger.info("Retrieved %d workflow execution logs", count)
             return APIResponse(
@@ -179,8 +188,15 @@ class WorkflowExecutionLogService:
             # Build query filter
             query_filter = {"central_workflow_id": central_workflow_id}
             
-            # Get logs filtered by central_workflow_id
-            all_logs = await WorkflowExecutionLogs.find(query_filter).to_list()
+            # Only the searched columns are fetched for scoring; full documents are loaded for the top matches
+            search_columns = [column for column, value in ((column1, value1), (column2, value2)) if column and value]
+            all_logs = await WorkflowExecutionLogs.find(query_filter).aggregate(
+                [{"$project": {
+                    "_id": 1,
+                    **{column: 1 for column in search_columns},
+                    **{f"search_norm.{column}": 1 for column in search_columns},
+                }}]
+            ).to_list()
             
             if not all_logs:
                 logger.info(f"No logs found for central_workflow_id: {central_workflow_id}")
@@ -190,55 +206,46 @@ class WorkflowExecutionLogService:
                     data=[]
                 )
             
+            # Score each searched column over all logs in one batched call (empty values never match)
+            scores1 = (
+                fuzzy_column_scores(
+                    value1, [log.get(column1) or None for log in all_logs], threshold,
+                    normalized=[log.get("search_norm", {}).get(column1) for log in all_logs], exact_int_match=False
+                )
+                if column1 and value1 else None
+            )
+            scores2 = (
+                fuzzy_column_scores(
+                    value2, [log.get(column2) or None for log in all_logs], threshold,
+                    normalized=[log.get("search_norm", {}).get(column2) for log in all_logs], exact_int_match=False
+                )
+                if column2 and value2 else None
+            )
+            
             matches = []
             
-            # Handle different search modes
-            for log in all_logs:
+            # A log matches when every searched column meets the threshold
+            # (no columns provided: return all for this central workflow)
+            for idx, log in enumerate(all_logs):
                 match_scores = {}
-                is_match = True
                 
-                # Check column1 if provided
-                if column1 and value1:
-                    log_value1 = getattr(log, column1, None)
-                    if log_value1:
-                        score1 = fuzz.partial_ratio(
-                            value1.lower(), 
-                            str(log_value1).lower()
-                        )
-                        match_scores["score1"] = score1
-                        if score1 < threshold:
-                            is_match = False
-                    else:
-                        is_match = False
+                if scores1 is not None:
+                    if idx not in scores1:
+                        continue
+                    match_scores["score1"] = scores1[idx]
                 
-                # Check column2 if provided
-                if column2 and value2:
-                    log_value2 = getattr(log, column2, None)
-                    if log_value2:
-                        score2 = fuzz.partial_ratio(
-                            value2.lower(), 
-                            str(log_value2).lower()
-                        )
-                        match_scores["score2"] = score2
-                        if score2 < threshold:
-                            is_match = False
-                    else:
-                        is_match = False
+                if scores2 is not None:
+                    if idx not in scores2:
+                        continue
+                    match_scores["score2"] = scores2[idx]
                 
-                # If no columns provided, it's a match (return all for this central workflow)
-                if not column1 and not column2:
-                    is_match = True
-                    matches.append({
-                        "log": log,
-                        "scores": match_scores  # Empty scores
-                    })
-                elif is_match:
-                    matches.append({
-                        "log": log,
-                        "scores": match_scores
-                    })
+                matches.append({
+                    "id": log["_id"],
+                    "scores": match_scores
+                })
+                if match_scores:
                     logger.debug(
-                        f"Match found: {log.id} (scores: {match_scores})"
+                        f"Match found: {log['_id']} (scores: {match_scores})"
                     )
             
             # Sort by highest score (prefer score1 if both, else score2, else arbitrary)
@@ -264,6 +271,14 @@ class WorkflowExecutionLogService:
                     data=[]
                 )
             
+            # Load the full documents for the top matches only, keeping the ranked order
+            top_docs = await WorkflowExecutionLogs.find({"_id": {"$in": [match["id"] for match in top_matches]}}).to_list()
+            docs_by_id = {doc.id: doc for doc in top_docs}
+            top_matches = [
+                {"log": docs_by_id[match["id"]], "scores": match["scores"]}
+                for match in top_matches if match["id"] in docs_by_id
+            ]
+            
             # Format response - handle type conversion
             results = []
             for match in top_matches:
@@ -0,0 +1,70 @@
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from rapidfuzz import fuzz, process
+
+
+def fuzzy_column_scores(
+    query: str,
+    values: Sequence[Any],
+    threshold: int,
+    exact_int_match: bool = True,
+    normalized: Optional[Sequence[Optional[str]]] = None
+) -> Dict[int, float]:
+    """
+    Score one column of candidate values against a query in a single rapidfuzz call.
+
+    String values are fuzzy matched (partial_ratio, case-insensitive); integer values
+    match exactly (100 / 0) when exact_int_match is set. None values never match.
+    normalized optionally holds precomputed lower-cased values (same order as values);
+    where present they are scored as-is instead of lower-casing the value per request.
+
+    Returns:
+        {index into values: score} for every value scoring at least threshold
+    """
+    query_int: Optional[int] = None
+    if exact_int_match:
+        try:
+            query_int = int(query)
+        except ValueError:
+            query_int = None
+
+    scores: Dict[int, float] = {}
+    # Candidate text -> row indexes: repeated values (statuses, triggers, users) are scored once
+    choices: Dict[str, List[int]] = {}
+    for idx, value in enumerate(values):
+        if value is None:
+            continue
+        if exact_int_match and isinstance(value, int):
+            score = 100 if query_int is not None and value == query_int else 0
+            if score >= threshold:
+                scores[idx] = score
+        elif normalized is not None and normalized[idx] is not None:
+            choices.setdefault(normalized[idx], []).append(idx)
+        else:
+            choices.setdefault(str(value).lower(), []).append(idx)
+
+    # Empty text always scores 0, so it can only meet a zero threshold
+    if threshold > 0:
+        choices.pop("", None)
+
+    if not choices:
+        return scores
+
+    # One multi-threaded C++ pass over the distinct texts (GIL released); score_cutoff zeroes
+    # everything below the threshold early. float64 keeps partial_ratio's fractional scores
+    texts = list(choices)
+    text_scores = process.cdist(
+        [query.lower()],
+        texts,
+        scorer=fuzz.partial_ratio,
+        score_cutoff=threshold,
+        dtype=np.float64,
+        workers=-1
+    )[0]
+
+    for text_idx in np.flatnonzero(text_scores >= threshold):
+        score = float(text_scores[text_idx])
+        for idx in choices[texts[text_idx]]:
+            scores[idx] = score
+
+    return scores
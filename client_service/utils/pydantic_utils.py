@@ -1,4 +1,6 @@
 # client_service/utils/pydantic_utils.py
+import orjson
+from fastapi import Response
 from pydantic import BaseModel
 
 def map_to_pydantic(model: BaseModel, data: dict) -> BaseModel:
@@ -9,3 +11,16 @@ def map_to_pydantic(model: BaseModel, data: dict) -> BaseModel:
     model_fields = model.model_fields.keys()
     filtered_data = {k: v for k, v in data.items() if k in model_fields}
     return model(**filtered_data)
+
+
+def to_json_response(payload: BaseModel, status_code: int = 200) -> Response:
+    """
+    Serialize an already-built response model straight to JSON bytes.
+    Used by list endpoints declared with response_model=None, so FastAPI does not
+    re-validate and re-encode large payloads the service has already validated.
+    """
+    return Response(
+        content=orjson.dumps(payload.model_dump(by_alias=True), default=str),
+        media_type="application/json",
+        status_code=status_code,
+    )